@@ -1,25 +1,39 @@
+import asyncio
 import os
+import sys
 import tomllib
+from contextlib import asynccontextmanager
+from functools import lru_cache
 from pathlib import Path
-from typing import List, Optional, get_args
+from typing import Any, Dict, List, Optional, Tuple, get_args
 
 from dotenv import find_dotenv, load_dotenv
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse, StreamingResponse
+from loguru import logger
 
 from api import rasters
+from api.cache import ResponseCache, request_cache_key
+from isolysis.isochrone import close_http_session
 from isolysis.models import (
     IsochroneRequest,
     IsochroneResponse,
     ProviderName,
 )
-from api.services import process_isochrone_request
+from api.services import (
+    process_isochrone_request,
+    stream_isochrone_request,
+    warmup,
+)
 
 # ---------- ENV SETUP ----------
-load_dotenv(find_dotenv(usecwd=True), override=True)
+DOTENV_PATH = find_dotenv(usecwd=True)
+load_dotenv(DOTENV_PATH, override=True)
 
 
 # ---------- READ PROJECT METADATA ----------
+@lru_cache(maxsize=1)
 def get_project_metadata():
     """Read project metadata from pyproject.toml"""
     pyproject_path = Path(__file__).parent.parent / "pyproject.toml"
@@ -31,21 +45,161 @@ def get_project_metadata():
 PROJECT_TITLE = "Isolysis Isochrone API"
 PROJECT_METADATA = get_project_metadata()
 
+# Identical isochrone requests (common from the interactive UI) are served from
+# here. The cache lives in each worker process; workers do not share entries
+ISOCHRONE_CACHE = ResponseCache(
+    maxsize=int(os.getenv("ISOLYSIS_CACHE_SIZE", "256")),
+    ttl=float(os.getenv("ISOLYSIS_CACHE_TTL", "600")),
+)
+
+
+# ---------- PROVIDERS ----------
+ALL_PROVIDERS: Tuple[ProviderName, ...] = get_args(ProviderName)
+
+PROVIDER_KEY_ENV: Dict[str, str] = {
+    "mapbox": "MAPBOX_API_KEY",
+    "iso4app": "ISO4APP_API_KEY",
+}
+
+# Snapshot of which keys are set, taken after load_dotenv and refreshed on startup
+# or when the .env file changes
+_PROVIDER_KEYS: Dict[str, bool] = {
+    provider: bool(os.getenv(env_var)) for provider, env_var in PROVIDER_KEY_ENV.items()
+}
+
+
+def _dotenv_mtime() -> Optional[float]:
+    """Modification time of the .env file, or None if there is none."""
+    try:
+        return os.stat(DOTENV_PATH).st_mtime if DOTENV_PATH else None
+    except OSError:
+        return None
+
+
+# .env mtime the current snapshot was read at
+_DOTENV_STATE: Dict[str, Optional[float]] = {"mtime": _dotenv_mtime()}
+
+PROVIDER_FEATURES: Dict[str, List[str]] = {
+    "osmnx": [
+        "Free",
+        "OpenStreetMap data",
+        "Global coverage",
+        "Offline capable",
+    ],
+    "iso4app": [
+        "European coverage",
+        "High precision",
+        "Multiple transport modes",
+    ],
+    "mapbox": ["Global coverage", "Fast computation", "Real traffic data"],
+}
 
+
+@lru_cache(maxsize=8)
 def validate_provider_keys(provider: ProviderName) -> Optional[str]:
     """Check if required API keys are present"""
-    if provider == "mapbox" and not os.getenv("MAPBOX_API_KEY"):
-        return "Missing MAPBOX_API_KEY environment variable"
-    if provider == "iso4app" and not os.getenv("ISO4APP_API_KEY"):
-        return "Missing ISO4APP_API_KEY environment variable"
-    return None
+    if _PROVIDER_KEYS.get(provider, True):
+        return None
+    return f"Missing {PROVIDER_KEY_ENV[provider]} environment variable"
+
+
+# /health and /providers payloads, precomputed from _PROVIDER_KEYS
+_HEALTH_RESPONSE: Dict[str, Any] = {}
+_PROVIDERS_RESPONSE: Dict[str, Any] = {}
+
+
+def _build_status_responses() -> None:
+    """Precompute the /health and /providers payloads from the current keys."""
+    errors = {provider: validate_provider_keys(provider) for provider in ALL_PROVIDERS}
+    available = [p for p, error in errors.items() if error is None]
+
+    _HEALTH_RESPONSE.clear()
+    _HEALTH_RESPONSE.update(
+        {
+            "status": "healthy" if available else "degraded",
+            "available_providers": available,
+            "unavailable_providers": [p for p in ALL_PROVIDERS if p not in available],
+        }
+    )
+    _PROVIDERS_RESPONSE.clear()
+    _PROVIDERS_RESPONSE.update(
+        {
+            "providers": {
+                provider: {
+                    "available": error is None,
+                    "error": error,
+                    "features": PROVIDER_FEATURES.get(provider, []),
+                }
+                for provider, error in errors.items()
+            },
+            "default": "osmnx",
+        }
+    )
+
+
+def refresh_provider_keys() -> None:
+    """Re-read provider keys from .env and the environment; rebuild cached status."""
+    _DOTENV_STATE["mtime"] = _dotenv_mtime()
+    if _DOTENV_STATE["mtime"] is not None:
+        load_dotenv(DOTENV_PATH, override=True)
+    _PROVIDER_KEYS.update(
+        {
+            provider: bool(os.getenv(env_var))
+            for provider, env_var in PROVIDER_KEY_ENV.items()
+        }
+    )
+    validate_provider_keys.cache_clear()
+    _build_status_responses()
+
+
+def sync_provider_keys() -> None:
+    """
+    Refresh provider keys if the .env file changed since the last read. Each
+    worker process holds its own snapshot, so each checks the shared file.
+    """
+    if _dotenv_mtime() != _DOTENV_STATE["mtime"]:
+        refresh_provider_keys()
+
+
+_build_status_responses()
+
+
+# ---------- LOGGING ----------
+def configure_logging() -> None:
+    """
+    Send API logs through loguru's background writer thread so request
+    handlers (notably bursts of per-centroid errors) never block on stderr.
+    """
+    logger.remove()
+    logger.add(
+        sys.stderr,
+        level=os.getenv("ISOLYSIS_LOG_LEVEL", "INFO"),
+        enqueue=True,
+        backtrace=False,
+        diagnose=False,
+    )
 
 
 # ---------- FASTAPI APP ----------
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Startup/shutdown hooks for the API process."""
+    configure_logging()
+    refresh_provider_keys()
+    if os.getenv("ISOLYSIS_WARMUP", "1") == "1":
+        await asyncio.to_thread(warmup)
+    yield
+    close_http_session()
+    rasters.shutdown_raster_workers()
+    await logger.complete()
+
+
 app = FastAPI(
     title=PROJECT_TITLE,
     version=PROJECT_METADATA["version"],
     description=PROJECT_METADATA["description"],
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan,
 )
 
 app.add_middleware(
@@ -80,69 +234,82 @@ def root():
 @app.get("/health")
 def health_check():
     """Health check with provider availability"""
-    all_providers: List[ProviderName] = list(get_args(ProviderName))
-    available_providers: List[ProviderName] = []
-    for provider in all_providers:
-        if not validate_provider_keys(provider):
-            available_providers.append(provider)
-
-    status = "healthy" if available_providers else "degraded"
-    response = {
-        "status": status,
-        "available_providers": available_providers,
-        "unavailable_providers": [
-            p for p in all_providers if p not in available_providers
-        ],
-    }
-
-    if not available_providers:
-        raise HTTPException(status_code=503, detail=response)
+    sync_provider_keys()
+    if not _HEALTH_RESPONSE["available_providers"]:
+        raise HTTPException(status_code=503, detail=_HEALTH_RESPONSE)
 
-    return response
+    return _HEALTH_RESPONSE
 
 
 @app.post("/isochrones", response_model=IsochroneResponse)
-def compute_isochrones_endpoint(request: IsochroneRequest):
+async def compute_isochrones_endpoint(request: IsochroneRequest):
     """Compute isochrones for multiple centroids with optional spatial analysis"""
+    sync_provider_keys()
     error_msg = validate_provider_keys(request.options.provider)
     if error_msg:
         raise HTTPException(status_code=503, detail=error_msg)
+
+    cache_key = request_cache_key(request)
+    cached = ISOCHRONE_CACHE.get(cache_key)
+    if cached is not None:
+        return Response(content=cached, media_type="application/json")
+
     try:
-        return process_isochrone_request(request)
+        response = await process_isochrone_request(request)
     except ValueError as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+    body = response.model_dump_json().encode()
+    # Partial results (failed centroids or analysis) are retried, not cached
+    if _is_complete(request, response):
+        ISOCHRONE_CACHE.set(cache_key, body)
+    return Response(content=body, media_type="application/json")
+
+
+def _is_complete(request: IsochroneRequest, response: IsochroneResponse) -> bool:
+    """True when every centroid, and the requested spatial analysis, succeeded."""
+    if response.successful_computations < response.total_centroids:
+        return False
+    return not request.pois or response.spatial_analysis is not None
+
+
+@app.post("/isochrones/stream")
+async def stream_isochrones_endpoint(request: IsochroneRequest):
+    """
+    Stream isochrones as NDJSON, one line per centroid as soon as it completes,
+    followed by a summary line with the optional spatial analysis.
+    """
+    sync_provider_keys()
+    error_msg = validate_provider_keys(request.options.provider)
+    if error_msg:
+        raise HTTPException(status_code=503, detail=error_msg)
+    return StreamingResponse(
+        stream_isochrone_request(request), media_type="application/x-ndjson"
+    )
+
 
 @app.get("/providers")
 def list_providers():
     """List available isochrone providers and their status"""
-    providers_info = {}
-
-    for provider in get_args(ProviderName):
-        error = validate_provider_keys(provider)
-        providers_info[provider] = {
-            "available": error is None,
-            "error": error,
-            "features": {
-                "osmnx": [
-                    "Free",
-                    "OpenStreetMap data",
-                    "Global coverage",
-                    "Offline capable",
-                ],
-                "iso4app": [
-                    "European coverage",
-                    "High precision",
-                    "Multiple transport modes",
-                ],
-                "mapbox": ["Global coverage", "Fast computation", "Real traffic data"],
-            }.get(provider, []),
-        }
-
-    return {"providers": providers_info, "default": "osmnx"}
+    sync_provider_keys()
+    return _PROVIDERS_RESPONSE
 
 
 if __name__ == "__main__":
     import uvicorn
 
-    uvicorn.run(app, host="0.0.0.0", port=8000, reload=True)
+    # uvloop/httptools ship with fastapi[standard] (uvicorn[standard])
+    dev = os.getenv("DEV") == "1"
+    # Caches and the raster worker pool are per process, so extra workers
+    # each warm their own; one worker unless ISOLYSIS_WORKERS asks for more
+    workers = 1 if dev else max(1, int(os.getenv("ISOLYSIS_WORKERS", "1")))
+    uvicorn.run(
+        "api.app:app",
+        host="0.0.0.0",
+        port=8000,
+        loop="uvloop",
+        http="httptools",
+        reload=dev,
+        workers=workers,
+        limit_concurrency=int(os.getenv("ISOLYSIS_LIMIT_CONCURRENCY", "64")),
+    )
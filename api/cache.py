@@ -0,0 +1,68 @@
+"""Bounded in-memory LRU + TTL cache for serialized API responses."""
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+from pydantic import BaseModel
+
+DEFAULT_MAXSIZE = 256
+DEFAULT_TTL_SECONDS = 600
+
+
+class ResponseCache:
+    """
+    Thread-safe LRU cache with per-entry expiry.
+
+    Values are stored as already-serialized JSON bytes so a cache hit can be
+    returned as-is, without Pydantic validation or re-serialization.
+    """
+
+    def __init__(
+        self, maxsize: int = DEFAULT_MAXSIZE, ttl: float = DEFAULT_TTL_SECONDS
+    ):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[str, Tuple[float, bytes]]" = OrderedDict()
+        self._lock = threading.RLock()
+
+    def get(self, key: str) -> Optional[bytes]:
+        """Return the cached value, or None if missing or expired."""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: bytes) -> None:
+        """Store a value, evicting the least recently used entry when full."""
+        with self._lock:
+            self._data[key] = (time.monotonic() + self.ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+def request_cache_key(request: BaseModel, extra: bytes = b"") -> str:
+    """
+    Hash a request model's canonical JSON into a short cache key. ``extra``
+    mixes in state the request does not carry (e.g. input file mtimes).
+    """
+    # Serialize straight to bytes in pydantic-core (field order is fixed by the
+    # model, so no key sorting is needed), skipping the str round-trip
+    blob = request.__pydantic_serializer__.to_json(request)
+    return hashlib.blake2b(blob + extra, digest_size=16).hexdigest()
@@ -1,10 +1,22 @@
 """Path resolution with traversal protection."""
 
-import os
+from pathlib import Path
 from typing import Optional
 
 from loguru import logger
 
+# Resolved once at import; the API process does not change directories
+PROJECT_ROOT = Path.cwd().resolve()
+
+
+def _resolve(path: str) -> Path:
+    """
+    Anchor relative paths at the project root, then collapse ".." and symlinks.
+    Not cached: the containment check must see where a symlink points now.
+    """
+    p = Path(path)
+    return (p if p.is_absolute() else PROJECT_ROOT / p).resolve()
+
 
 def resolve_project_path(path: str, must_exist: bool = True) -> Optional[str]:
     """
@@ -23,27 +35,15 @@ def resolve_project_path(path: str, must_exist: bool = True) -> Optional[str]:
     if not path:
         return None
 
-    try:
-        # Normalize slashes and collapse redundant parts
-        p = os.path.normpath(path)
-
-        # Convert to absolute if relative
-        if not os.path.isabs(p):
-            p = os.path.join(os.getcwd(), p)
-
-        # Containment check: block path traversal outside project root
-        project_root = os.getcwd()
-        if not p.startswith(project_root + os.sep) and p != project_root:
-            logger.error(
-                f"Path traversal blocked: '{path}' resolves outside project root"
-            )
-            return None
-
-        # Warn if missing
-        if must_exist and not os.path.exists(p):
-            logger.warning(f"File not found or inaccessible: {p}")
-
-        return p
-    except Exception as e:
-        logger.error(f"Failed to resolve path '{path}': {e}")
-        return path
+    p = _resolve(path)
+
+    # Containment check: block path traversal outside project root
+    if not p.is_relative_to(PROJECT_ROOT):
+        logger.error(f"Path traversal blocked: '{path}' resolves outside project root")
+        return None
+
+    # Warn if missing
+    if must_exist and not p.exists():
+        logger.warning(f"File not found or inaccessible: {p}")
+
+    return str(p)
@@ -1,25 +1,53 @@
 """FastAPI router for raster statistics endpoints."""
 
+import asyncio
 import os
+import sys
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Set, Tuple
 
 import geopandas as gpd
-from fastapi import APIRouter, HTTPException
+import orjson
+import shapely
+from fastapi import APIRouter, HTTPException, Response
 from loguru import logger
-from shapely.geometry import shape
 
+from api.cache import ResponseCache, request_cache_key
 from api.path_utils import resolve_project_path
 from isolysis.models import RasterStatsRequest
-from isolysis.raster import (
-    compute_intersection_stats,
-    compute_stats_for_geometries,
-    log_summary,
-)
 
 router = APIRouter(prefix="/raster-stats", tags=["Raster Analysis"])
 
+# Bounds how many raster jobs run at once; the rest wait without holding threads
+RASTER_SEMAPHORE = asyncio.Semaphore(int(os.getenv("ISOLYSIS_RASTER_CONCURRENCY", "4")))
+
+# Identical requests over unchanged files (common on Streamlit reruns) are
+# served from here without touching the rasters
+RASTER_CACHE = ResponseCache(
+    maxsize=int(os.getenv("ISOLYSIS_RASTER_CACHE_SIZE", "64")),
+    ttl=float(os.getenv("ISOLYSIS_CACHE_TTL", "600")),
+)
+
+
+def _mtime(path: str) -> Optional[float]:
+    """Modification time of path, or None if it does not exist (a single stat)."""
+    try:
+        return os.stat(path).st_mtime
+    except OSError:
+        return None
+
+
+@lru_cache(maxsize=16)
+def _load_boundary(path: str, mtime: float) -> gpd.GeoDataFrame:
+    """
+    Read a boundary file reprojected to EPSG:4326. Cached per path; the mtime
+    is part of the key so an edited file is re-read. Callers must not mutate it.
+    """
+    return gpd.read_file(path).to_crs(4326)
+
 
 @router.post("")
-def raster_stats_endpoint(payload: RasterStatsRequest):
+async def raster_stats_endpoint(payload: RasterStatsRequest):
     """
     Compute raster statistics for:
       - Isochrone geometries (and their intersections)
@@ -27,50 +55,107 @@ def raster_stats_endpoint(payload: RasterStatsRequest):
 
     Returns flattened results suitable for display.
     """
+    inputs = await asyncio.to_thread(_resolve_inputs, payload)
+    cache_key = inputs[-1]
+    cached = RASTER_CACHE.get(cache_key)
+    if cached is not None:
+        return Response(content=cached, media_type="application/json")
+
+    # Raster I/O and geometry work is blocking; keep it off the event loop
+    async with RASTER_SEMAPHORE:
+        body, complete = await asyncio.to_thread(
+            _compute_raster_stats, payload, *inputs[:-1]
+        )
+    # Zero-filled stats from a failed raster read must not outlive the failure
+    if complete:
+        RASTER_CACHE.set(cache_key, body)
+    return Response(content=body, media_type="application/json")
+
+
+def _resolve_inputs(
+    payload: RasterStatsRequest,
+) -> Tuple[List[Dict[str, Any]], Optional[str], Optional[float], str]:
+    """
+    Resolve and stat every input file once. Returns the raster dicts, the
+    boundary path and mtime, and a cache key over the request plus the files'
+    mtimes, so an edited or replaced file misses the cache.
+    """
+    rasters = [r.model_dump() for r in payload.rasters]
+    # The "exists" flag travels with the raster dict so downstream code does
+    # not check existence again
+    mtimes = []
+    for r in rasters:
+        r["path"] = resolve_project_path(r["path"], must_exist=False)
+        mtime = _mtime(r["path"]) if r["path"] else None
+        r["exists"] = mtime is not None
+        mtimes.append(mtime)
+        logger.debug(f"Exists({r['path']}): {r['exists']}")
+
+    raw_boundary = payload.boundary_path
+    boundary_path = (
+        resolve_project_path(raw_boundary, must_exist=False) if raw_boundary else None
+    )
+    boundary_mtime = _mtime(boundary_path) if boundary_path else None
+
+    cache_key = request_cache_key(payload, extra=orjson.dumps([mtimes, boundary_mtime]))
+    return rasters, boundary_path, boundary_mtime, cache_key
+
+
+def _compute_raster_stats(
+    payload: RasterStatsRequest,
+    rasters: List[Dict[str, Any]],
+    boundary_path: Optional[str],
+    boundary_mtime: Optional[float],
+) -> Tuple[bytes, bool]:
+    """
+    Synchronous body of the raster stats endpoint. Returns the JSON body and
+    whether every existing raster was read (only then is it cacheable).
+    """
+    # Deferred so rasterio is only loaded once a raster request arrives, not at
+    # API start-up (cache hits never load it)
+    from isolysis.raster import (
+        compute_isochrone_stats,
+        compute_stats_for_geometries,
+        log_summary,
+    )
+
+    failed: Set[str] = set()
     try:
-        rasters = [r.model_dump() for r in payload.rasters]
-        raw_boundary = payload.boundary_path
-        boundary_path = resolve_project_path(raw_boundary) if raw_boundary else None
         isochrones = payload.isochrones
 
         if not rasters:
             raise HTTPException(status_code=400, detail="Missing raster files.")
 
-        for r in rasters:
-            r["path"] = resolve_project_path(r["path"])
-
-        logger.debug(f"Working dir: {os.getcwd()}")
-        for r in rasters:
-            logger.debug(f"Exists({r['path']}): {os.path.exists(r['path'])}")
         logger.debug(f"Boundary provided: {bool(boundary_path)}")
 
         # CASE 1: Boundary
-        if boundary_path and os.path.exists(boundary_path):
+        if boundary_mtime is not None:
             logger.info(f"Running BOUNDARY mode with file: {boundary_path}")
-            gdf = gpd.read_file(boundary_path).to_crs(4326)
-            results = compute_stats_for_geometries(gdf, rasters, scope="boundary")
+            gdf = _load_boundary(boundary_path, boundary_mtime)
+            results = compute_stats_for_geometries(
+                gdf, rasters, scope="boundary", failed=failed
+            )
             log_summary(results, label="Boundary stats")
-            return {"results": results}
+            return _results_body(results), not failed
 
         # CASE 2: Isochrones
         elif isochrones:
             logger.info(f"Running ISOCHRONE mode for {len(isochrones)} centroids")
+            # Decode all geometries in one shapely (GEOS) call
+            geoms = shapely.from_geojson(
+                [orjson.dumps(i["geometry"]) for i in isochrones]
+            )
             iso_gdf = gpd.GeoDataFrame(
-                [
-                    {"centroid_id": i["centroid_id"], "geometry": shape(i["geometry"])}
-                    for i in isochrones
-                ],
+                {"centroid_id": [i["centroid_id"] for i in isochrones]},
+                geometry=geoms,
                 crs="EPSG:4326",
             )
-            results = compute_stats_for_geometries(iso_gdf, rasters, scope="isochrone")
-
-            # Add intersection stats
-            for raster in rasters:
-                inter_stats = compute_intersection_stats(iso_gdf, raster["path"])
-                results.extend(inter_stats)
+            # Intersections are computed once and read with the isochrones
+            # in a single pass per raster
+            results = compute_isochrone_stats(iso_gdf, rasters, failed=failed)
 
             log_summary(results, label="Isochrone stats")
-            return {"results": results}
+            return _results_body(results), not failed
 
         else:
             raise HTTPException(
@@ -83,3 +168,15 @@ def raster_stats_endpoint(payload: RasterStatsRequest):
     except Exception as e:
         logger.exception(f"Raster analysis failed: {e}")
         raise HTTPException(status_code=500, detail="Internal raster analysis error")
+
+
+def shutdown_raster_workers() -> None:
+    """Stop the raster worker pool, if the raster module was ever loaded."""
+    raster = sys.modules.get("isolysis.raster")
+    if raster is not None:
+        raster.shutdown_process_pool()
+
+
+def _results_body(results: List[Dict[str, Any]]) -> bytes:
+    """Serialize results once; the same bytes are cached and returned."""
+    return orjson.dumps({"results": results}, option=orjson.OPT_SERIALIZE_NUMPY)
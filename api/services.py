@@ -1,13 +1,19 @@
 """Service layer for isochrone endpoint business logic."""
 
-from typing import Dict, List, Optional
+import asyncio
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
 
+import geopandas as gpd
+import orjson
 from loguru import logger
+from pydantic import TypeAdapter
+from shapely.geometry import box
 
-from isolysis.analysis import analyze_isochrones_with_pois
-from isolysis.constants import CRS_WGS84
-from isolysis.isochrone import compute_isochrones
+from isolysis.analysis import analyze_isochrones_with_pois, compute_spatial_analysis
+from isolysis.isochrone import get_isochrone_provider
 from isolysis.models import (
+    POI,
+    CentroidRequest,
     IsochroneRequest,
     IsochroneResponse,
     IsochroneResult,
@@ -15,123 +21,266 @@ from isolysis.models import (
 )
 from isolysis.utils import harmonize_isochrones_columns
 
+# Bulk-dumps request centroids to provider payload dicts in pydantic-core
+_CENTROIDS_ADAPTER = TypeAdapter(List[CentroidRequest])
+_CENTROID_PAYLOAD_FIELDS = {"__all__": {"lat", "lon", "rho", "id"}}
 
-def process_isochrone_request(request: IsochroneRequest) -> IsochroneResponse:
+
+async def process_isochrone_request(request: IsochroneRequest) -> IsochroneResponse:
     """
     Process an isochrone computation request with optional spatial analysis.
 
+    Centroids are dispatched concurrently to worker threads so that total
+    latency tracks the slowest centroid rather than the sum of all of them.
+
     Returns IsochroneResponse on success.
     Raises ValueError if no isochrones could be computed.
     """
     provider = request.options.provider
+    _log_request(request)
+
+    errors: List[str] = []
+    valid: List[Tuple[str, List[Dict[str, Any]]]] = []
+
+    centroid_ids, tasks = _dispatch_centroids(request)
+    results_raw = await asyncio.gather(*tasks, return_exceptions=True)
+
+    # Keep request order (gather preserves task order); drop failed centroids
+    for centroid_id, isos in zip(centroid_ids, results_raw):
+        try:
+            _check_isochrones(centroid_id, isos)
+        except Exception as e:
+            logger.error(f"Failed to compute isochrone for {centroid_id}: {str(e)}")
+            errors.append(f"{centroid_id}: {e}")
+            continue
+        valid.append((centroid_id, isos))
+
+    if not valid:
+        reason = errors[0] if len(errors) == 1 else f"{len(errors)} failures"
+        raise ValueError(f"Failed to compute any isochrones — {reason}")
+
+    # One harmonized frame for the whole batch: sliced per centroid for
+    # GeoJSON and reused as-is by the spatial analysis (CPU-bound, off-loop)
+    results, isochrones_gdf = await asyncio.to_thread(_build_results, valid)
+    spatial_analysis = await asyncio.to_thread(
+        _run_spatial_analysis, request, isochrones_gdf
+    )
+    successful = len(results)
 
     logger.info(
-        f"Computing isochrones for {len(request.centroids)} centroids using {provider}"
+        f"Successfully computed {successful}/{len(request.centroids)} isochrones"
     )
-    if request.pois:
-        logger.info(f"POI analysis requested for {len(request.pois)} points")
 
-    results: List[IsochroneResult] = []
+    # Every field is built by this module from already-validated models, so
+    # skip re-validating the (potentially large) nested GeoJSON
+    return IsochroneResponse.model_construct(
+        provider=provider,
+        results=results,
+        total_centroids=len(request.centroids),
+        successful_computations=successful,
+        spatial_analysis=spatial_analysis,
+    )
+
+
+async def stream_isochrone_request(
+    request: IsochroneRequest,
+) -> AsyncIterator[bytes]:
+    """
+    Stream an isochrone request as NDJSON, one line per centroid as it completes.
+
+    Lines are typed: {"type": "isochrone", ...IsochroneResult} for successes,
+    {"type": "error", "centroid_id", "detail"} for failures, and a final
+    {"type": "summary", ...} carrying the counts and optional spatial analysis.
+    """
+    provider = request.options.provider
+    _log_request(request)
+
     successful = 0
-    all_isochrone_records = []
-    errors: List[str] = []
 
-    # Process each centroid
-    for idx, centroid in enumerate(request.centroids):
-        centroid_id = centroid.id or f"centroid_{idx}"
+    centroid_ids, tasks = _dispatch_centroids(request)
+    # Records are kept by request index: lines go out in completion order, but
+    # the analysis must see the same order as /isochrones on every run
+    records_by_index: List[List[Dict[str, Any]]] = [[] for _ in tasks]
+    tagged = [_tagged(i, task) for i, task in enumerate(tasks)]
 
+    for done in asyncio.as_completed(tagged):
+        idx, isos = await done
+        centroid_id = centroid_ids[idx]
         try:
-            logger.info(
-                f"Computing isochrone for {centroid_id} at ({centroid.lat}, {centroid.lon})"
+            result = await asyncio.to_thread(_build_result, centroid_id, isos)
+        except Exception as e:
+            logger.error(f"Failed to compute isochrone for {centroid_id}: {str(e)}")
+            yield _ndjson(
+                {"type": "error", "centroid_id": centroid_id, "detail": str(e)}
             )
+            continue
 
-            centroid_data = {
-                "lat": centroid.lat,
-                "lon": centroid.lon,
-                "rho": centroid.rho,
-                "id": centroid_id,
-            }
-
-            kwargs = {
-                "provider": provider,
-                "travel_speed_kph": request.options.travel_speed_kph,
-                "num_bands": request.options.num_bands,
-            }
-
-            if request.options.profile:
-                kwargs["profile"] = request.options.profile
-
-            kwargs.update(
-                {
-                    "value_type": request.options.iso4app_type,
-                    "travel_type": request.options.iso4app_mobility,
-                    "speed_type": request.options.iso4app_speed_type,
-                    "speed_limit": request.options.iso4app_speed_limit,
-                }
-            )
+        records_by_index[idx] = isos
+        successful += 1
+        # Shallow field view: orjson serializes the GeoJSON dict in place,
+        # where model_dump() would first deep-copy every coordinate
+        yield _ndjson({"type": "isochrone", **dict(result)})
 
-            isos = compute_isochrones([centroid_data], **kwargs)
+    spatial_analysis = None
+    if successful and request.pois:
+        all_isochrone_records = [record for isos in records_by_index for record in isos]
+        isochrones_gdf = await asyncio.to_thread(
+            harmonize_isochrones_columns, all_isochrone_records
+        )
+        spatial_analysis = await asyncio.to_thread(
+            _run_spatial_analysis, request, isochrones_gdf
+        )
 
-            if not isos:
-                logger.warning(f"No isochrones returned for {centroid_id}")
-                errors.append(f"{centroid_id}: no isochrones returned")
-                continue
+    yield _ndjson(
+        {
+            "type": "summary",
+            "provider": provider,
+            "total_centroids": len(request.centroids),
+            "successful_computations": successful,
+            # Serialized once by pydantic-core and spliced in verbatim
+            "spatial_analysis": (
+                orjson.Fragment(spatial_analysis.model_dump_json())
+                if spatial_analysis
+                else None
+            ),
+        }
+    )
 
-            all_isochrone_records.extend(isos)
 
-            # Convert to GeoDataFrame and then to GeoJSON
-            gdf = harmonize_isochrones_columns(isos)
-            if gdf.crs is None:
-                gdf.set_crs(CRS_WGS84, inplace=True)
+def _log_request(request: IsochroneRequest) -> None:
+    """Log the request size and provider."""
+    logger.info(
+        f"Computing isochrones for {len(request.centroids)} centroids "
+        f"using {request.options.provider}"
+    )
+    if request.pois:
+        logger.info(f"POI analysis requested for {len(request.pois)} points")
 
-            geojson = gdf.__geo_interface__
 
-            results.append(
-                IsochroneResult(
-                    centroid_id=centroid_id,
-                    geojson=geojson,
-                    coverage=None,
-                )
+def _dispatch_centroids(
+    request: IsochroneRequest,
+) -> Tuple[List[str], List["asyncio.Task[List[Dict[str, Any]]]"]]:
+    """Start one worker-thread task per centroid; returns ids and tasks in order."""
+    kwargs = _build_provider_kwargs(request)
+
+    # One provider instance per request; providers use the process-wide pooled
+    # HTTP session, so centroids and later requests reuse keep-alive connections.
+    iso_provider = get_isochrone_provider(request.options.provider)
+    centroid_dicts = _CENTROIDS_ADAPTER.dump_python(
+        request.centroids, include=_CENTROID_PAYLOAD_FIELDS
+    )
+    centroid_ids: List[str] = []
+    tasks = []
+    for idx, centroid_data in enumerate(centroid_dicts):
+        centroid_id = centroid_data["id"] or f"centroid_{idx}"
+        centroid_data["id"] = centroid_id
+        centroid_ids.append(centroid_id)
+        logger.info(
+            f"Computing isochrone for {centroid_id} at "
+            f"({centroid_data['lat']}, {centroid_data['lon']})"
+        )
+        tasks.append(
+            asyncio.create_task(
+                asyncio.to_thread(iso_provider.compute, [centroid_data], **kwargs)
             )
+        )
+    return centroid_ids, tasks
 
-            successful += 1
-            logger.success(f"Successfully computed isochrone for {centroid_id}")
 
-        except Exception as e:
-            logger.error(f"Failed to compute isochrone for {centroid_id}: {str(e)}")
-            errors.append(f"{centroid_id}: {e}")
-            continue
+async def _tagged(idx: int, task: "asyncio.Task") -> Tuple[int, Any]:
+    """Await a centroid task, pairing its output (or exception) with its index."""
+    try:
+        return idx, await task
+    except Exception as e:
+        return idx, e
 
-    if successful == 0:
-        reason = errors[0] if len(errors) == 1 else f"{len(errors)} failures"
-        raise ValueError(f"Failed to compute any isochrones — {reason}")
 
-    # Perform spatial analysis if POIs provided
-    spatial_analysis = _run_spatial_analysis(request, all_isochrone_records)
+def _check_isochrones(centroid_id: str, isos: Any) -> None:
+    """Raise if the provider failed (isos is the exception) or returned nothing."""
+    if isinstance(isos, BaseException):
+        raise isos
+    if not isos:
+        logger.warning(f"No isochrones returned for {centroid_id}")
+        raise ValueError("no isochrones returned")
 
-    logger.info(
-        f"Successfully computed {successful}/{len(request.centroids)} isochrones"
+
+def _to_result(centroid_id: str, gdf: gpd.GeoDataFrame) -> IsochroneResult:
+    """Serialize one centroid's harmonized isochrones into an IsochroneResult."""
+    # Plain dict straight from the frame; skip the per-feature and
+    # collection bbox that __geo_interface__ computes but no client reads
+    geojson = gdf.to_geo_dict(show_bbox=False)
+
+    logger.success(f"Successfully computed isochrone for {centroid_id}")
+    # Trusted internal data: model_construct skips walking every coordinate
+    return IsochroneResult.model_construct(
+        centroid_id=centroid_id, geojson=geojson, coverage=None
     )
 
-    return IsochroneResponse(
-        provider=provider,
-        results=results,
-        total_centroids=len(request.centroids),
-        successful_computations=successful,
-        spatial_analysis=spatial_analysis,
+
+def _build_result(centroid_id: str, isos: Any) -> IsochroneResult:
+    """Turn one centroid's provider output into an IsochroneResult."""
+    _check_isochrones(centroid_id, isos)
+    return _to_result(centroid_id, harmonize_isochrones_columns(isos))
+
+
+def _build_results(
+    valid: List[Tuple[str, List[Dict[str, Any]]]],
+) -> Tuple[List[IsochroneResult], gpd.GeoDataFrame]:
+    """
+    Harmonize every centroid's records in a single GeoDataFrame and slice it
+    per centroid, instead of building one frame per centroid.
+    """
+    all_records = [record for _, isos in valid for record in isos]
+    gdf = harmonize_isochrones_columns(all_records)
+
+    # Pre-sized and filled by index, so order follows the request, not completion
+    results: List[Optional[IsochroneResult]] = [None] * len(valid)
+    start = 0
+    for i, (centroid_id, isos) in enumerate(valid):
+        stop = start + len(isos)
+        # Reset the index so feature ids restart at 0 for each centroid
+        chunk = gdf.iloc[start:stop].reset_index(drop=True)
+        results[i] = _to_result(centroid_id, chunk)
+        start = stop
+    return results, gdf
+
+
+def _ndjson(payload: Dict[str, Any]) -> bytes:
+    """Serialize one NDJSON line."""
+    return orjson.dumps(payload, option=orjson.OPT_SERIALIZE_NUMPY) + b"\n"
+
+
+def _build_provider_kwargs(request: IsochroneRequest) -> Dict[str, Any]:
+    """Build the provider keyword arguments shared by every centroid."""
+    kwargs: Dict[str, Any] = {
+        "travel_speed_kph": request.options.travel_speed_kph,
+        "num_bands": request.options.num_bands,
+    }
+
+    if request.options.profile:
+        kwargs["profile"] = request.options.profile
+
+    kwargs.update(
+        {
+            "value_type": request.options.iso4app_type,
+            "travel_type": request.options.iso4app_mobility,
+            "speed_type": request.options.iso4app_speed_type,
+            "speed_limit": request.options.iso4app_speed_limit,
+        }
     )
+    return kwargs
 
 
 def _run_spatial_analysis(
     request: IsochroneRequest,
-    all_isochrone_records: list,
+    isochrones_gdf: gpd.GeoDataFrame,
 ) -> Optional[SpatialAnalysisResult]:
     """Run spatial analysis if POIs are provided."""
     if not request.pois:
         logger.debug("No POIs provided, skipping spatial analysis")
         return None
 
-    if not all_isochrone_records:
+    if isochrones_gdf.empty:
         logger.warning(
             "POIs provided but no isochrones computed, skipping spatial analysis"
         )
@@ -145,8 +294,8 @@ def _run_spatial_analysis(
             if centroid.max_production is not None:
                 max_production_by_centroid[centroid_id] = centroid.max_production
 
-        result = analyze_isochrones_with_pois(
-            all_isochrone_records,
+        result = compute_spatial_analysis(
+            isochrones_gdf,
             request.pois,
             min_overlap=2,
             max_combinations=100,
@@ -163,3 +312,17 @@ def _run_spatial_analysis(
     except Exception as e:
         logger.error(f"Spatial analysis failed: {str(e)}")
         return None
+
+
+def warmup() -> None:
+    """
+    Run a tiny synthetic spatial analysis so one-off costs (lazy imports,
+    PROJ database load, GEOS/STRtree setup) are paid before the first request.
+    """
+    records = [
+        {"centroid_id": "warmup_a", "band_hours": 0.5, "geometry": box(0, 0, 2, 2)},
+        {"centroid_id": "warmup_b", "band_hours": 0.5, "geometry": box(1, 0, 3, 2)},
+    ]
+    pois = [POI(id="warmup", lat=1.0, lon=1.5)]
+    analyze_isochrones_with_pois(records, pois)
+    logger.info("Spatial analysis warmup complete")
@@ -1,11 +1,14 @@
+from collections import defaultdict
 from datetime import datetime
-from itertools import combinations
-from typing import Any, Dict, List, Optional, cast
+from functools import lru_cache
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple, cast
 
 import geopandas as gpd
+import numpy as np
 import pandas as pd
+import shapely
 from loguru import logger
-from shapely.geometry import Point
+from pyproj import Transformer
 from shapely.geometry.base import BaseGeometry
 
 from isolysis.constants import CRS_WEB_MERCATOR, CRS_WGS84
@@ -20,8 +23,16 @@ from isolysis.models import (
 )
 
 
+# Shared empty result for intersections ruled out by their envelopes
+_EMPTY = shapely.Polygon()
+
+
+@lru_cache(maxsize=256)
 def format_time_display(hours: float) -> str:
-    """Convert hours to a readable time format"""
+    """
+    Convert hours to a readable time format. Memoized: a handful of distinct
+    band values are formatted for every isochrone row and intersection.
+    """
     if hours < 1:
         minutes = int(hours * 60)
         return f"{minutes}min"
@@ -31,9 +42,120 @@ def format_time_display(hours: float) -> str:
         return f"{hours}h"
 
 
-def _extract_centroid_id(row, idx) -> str:
-    """Extract centroid_id from an isochrone row, with fallback."""
-    return str(row.get("centroid_id") or row.get("id") or f"unknown_{idx}")
+def _extract_centroid_ids(gdf: gpd.GeoDataFrame) -> List[str]:
+    """Extract centroid_id for every isochrone row (column-wise), with fallback."""
+    missing = [None] * len(gdf)
+    cids = gdf["centroid_id"].tolist() if "centroid_id" in gdf.columns else missing
+    ids = gdf["id"].tolist() if "id" in gdf.columns else missing
+    return [
+        str(cid or id_ or f"unknown_{idx}")
+        for cid, id_, idx in zip(cids, ids, gdf.index)
+    ]
+
+
+def _poi_tree(pois_gdf: gpd.GeoDataFrame, crs: Any = None) -> shapely.STRtree:
+    """
+    Build an STRtree over POI points for indexed point-in-polygon queries.
+
+    Points are reprojected once to crs (the isochrones' CRS) when it differs,
+    so every query compares like with like. Positions are unchanged.
+    """
+    points = pois_gdf.geometry
+    if crs is not None and points.crs is not None and not points.crs.equals(crs):
+        points = points.to_crs(crs)
+    return shapely.STRtree(points.values)
+
+
+def _pois_within_many(
+    tree: shapely.STRtree, geometries: List[BaseGeometry]
+) -> List[np.ndarray]:
+    """
+    Positional indices (sorted) of the POIs inside each geometry, from a
+    single STRtree query over all geometries instead of one query each.
+    """
+    if not geometries:
+        return []
+    geoms = np.empty(len(geometries), dtype=object)
+    geoms[:] = geometries
+    geom_idx, poi_idx = tree.query(geoms, predicate="contains")
+    order = np.lexsort((poi_idx, geom_idx))
+    geom_idx, poi_idx = geom_idx[order], poi_idx[order]
+    splits = np.searchsorted(geom_idx, np.arange(1, len(geoms)))
+    return np.split(poi_idx, splits)
+
+
+def _overlap_groups(
+    geoms: List[BaseGeometry],
+) -> Iterator[Tuple[int, List[Tuple[int, ...]]]]:
+    """
+    Yield (r, groups) for r = 2, 3, ...: index groups whose geometries all
+    pairwise overlap, each size in lexicographic order.
+
+    One STRtree query finds the overlapping pairs; every r-way group extends an
+    (r-1)-way group by a common neighbour of all its members, so groups with a
+    disjoint pair are never generated. Sizes are built lazily, only when the
+    caller asks for the next one.
+    """
+    left, right = shapely.STRtree(geoms).query(geoms, predicate="intersects")
+    # Forward neighbours only (b > a), so each group is generated once, sorted
+    neighbors: List[Set[int]] = [set() for _ in geoms]
+    for a, b in zip(left.tolist(), right.tolist()):
+        if a < b:
+            neighbors[a].add(b)
+
+    groups = sorted((a, b) for a, nbrs in enumerate(neighbors) for b in nbrs)
+    r = 2
+    while groups:
+        yield r, groups
+        groups = [
+            group + (j,)
+            for group in groups
+            for j in sorted(set.intersection(*(neighbors[i] for i in group)))
+        ]
+        r += 1
+
+
+def _envelopes_overlap(a: BaseGeometry, b: BaseGeometry) -> bool:
+    """Bounding-box overlap test, far cheaper than a GEOS intersection."""
+    ax0, ay0, ax1, ay1 = a.bounds
+    bx0, by0, bx1, by1 = b.bounds
+    return ax0 <= bx1 and bx0 <= ax1 and ay0 <= by1 and by0 <= ay1
+
+
+def _group_intersection(
+    group: Tuple[int, ...],
+    polys: List[Dict[str, Any]],
+    cache: Dict[Tuple[int, ...], BaseGeometry],
+) -> BaseGeometry:
+    """
+    Intersection of the polygons in group, built from its (memoized) prefix
+    group so each r-way result costs one GEOS intersection. An empty prefix
+    is passed through, and a prefix whose envelope no longer reaches the last
+    polygon gives an empty result, both without calling GEOS.
+    """
+    if len(group) == 1:
+        return polys[group[0]]["geometry"]
+    inter = cache.get(group)
+    if inter is None:
+        prefix = _group_intersection(group[:-1], polys, cache)
+        last = polys[group[-1]]["geometry"]
+        if prefix.is_empty:
+            inter = prefix
+        elif not _envelopes_overlap(prefix, last):
+            inter = _EMPTY
+        else:
+            inter = prefix.intersection(last)
+        cache[group] = inter
+    return inter
+
+
+def _production_values(metadata: Any, count: int) -> np.ndarray:
+    """Float "Prod" value per POI metadata dict (missing or empty -> 0.0)."""
+    return np.fromiter(
+        (float((m or {}).get("Prod", 0) or 0) for m in metadata),
+        dtype=np.float64,
+        count=count,
+    )
 
 
 def pois_to_geodataframe(pois: List[POI]) -> gpd.GeoDataFrame:
@@ -46,20 +168,25 @@ def pois_to_geodataframe(pois: List[POI]) -> gpd.GeoDataFrame:
 
     logger.debug(f"Converting {len(pois)} POIs to GeoDataFrame")
 
-    data = []
-    for poi in pois:
-        data.append(
-            {
-                "id": poi.id,
-                "name": poi.name,
-                "region": poi.region,
-                "municipality": poi.municipality,
-                "geometry": Point(poi.lon, poi.lat),
-                "metadata": poi.metadata,
-            }
-        )
-
-    return gpd.GeoDataFrame(data, crs="EPSG:4326")
+    # Columnar build: coordinates go straight into numpy arrays and the points
+    # are created in one vectorized call instead of one Point per POI
+    n = len(pois)
+    lons = np.fromiter((poi.lon for poi in pois), dtype=np.float64, count=n)
+    lats = np.fromiter((poi.lat for poi in pois), dtype=np.float64, count=n)
+    metadata = [poi.metadata for poi in pois]
+
+    return gpd.GeoDataFrame(
+        {
+            "id": [poi.id for poi in pois],
+            "name": [poi.name for poi in pois],
+            "region": [poi.region for poi in pois],
+            "municipality": [poi.municipality for poi in pois],
+            "metadata": metadata,
+            "prod": _production_values(metadata, n),
+        },
+        geometry=gpd.points_from_xy(lons, lats),
+        crs=CRS_WGS84,
+    )
 
 
 def compute_band_coverage(
@@ -76,9 +203,24 @@ def compute_band_coverage(
         pois_gdf: GeoDataFrame with POI points
         max_production_by_centroid: Dict mapping centroid_id to max_production threshold
     """
+    coverages, _ = _compute_band_coverage(
+        isochrones_gdf, pois_gdf, max_production_by_centroid
+    )
+    return coverages
+
+
+def _compute_band_coverage(
+    isochrones_gdf: gpd.GeoDataFrame,
+    pois_gdf: gpd.GeoDataFrame,
+    max_production_by_centroid: Optional[Dict[str, float]] = None,
+) -> Tuple[List[BandCoverage], Set[str]]:
+    """
+    compute_band_coverage, also returning the set of POI ids covered by any
+    band, so callers need not rebuild it from every band's id list.
+    """
     if pois_gdf.empty:
         logger.warning("No POIs provided for coverage analysis")
-        return []
+        return [], set()
 
     logger.info(
         f"Analyzing coverage for {len(isochrones_gdf)} isochrone polygons and {len(pois_gdf)} points..."
@@ -87,28 +229,37 @@ def compute_band_coverage(
     coverage_results = []
     total_pois = len(pois_gdf)
     max_production_by_centroid = max_production_by_centroid or {}
+    tree = _poi_tree(pois_gdf, isochrones_gdf.crs)
+    poi_id_values = pois_gdf["id"].to_numpy()
+
+    # Per-POI production: the precomputed column when the GeoDataFrame came
+    # from pois_to_geodataframe, else parsed from metadata once (not per band)
+    if "prod" in pois_gdf.columns:
+        poi_production = pois_gdf["prod"].to_numpy(dtype=np.float64)
+    elif "metadata" in pois_gdf.columns:
+        poi_production = _production_values(pois_gdf["metadata"], total_pois)
+    else:
+        poi_production = None
 
-    for idx, row in isochrones_gdf.iterrows():
-        centroid_id = _extract_centroid_id(row, idx)
-        band_hours = float(row["band_hours"])
-        geometry = cast(BaseGeometry, row["geometry"])
+    # Every band's POI matches from one STRtree query (sorted positions each)
+    centroid_ids = _extract_centroid_ids(isochrones_gdf)
+    positions_by_band = _pois_within_many(tree, list(isochrones_gdf.geometry.values))
 
-        # Fast spatial intersection using within()
-        matches = pois_gdf[pois_gdf.geometry.within(geometry)]
-        poi_count = len(matches)
-        poi_ids = matches["id"].tolist()
+    # Plain column arrays: no per-row Series boxing
+    for centroid_id, band_hours, positions in zip(
+        centroid_ids,
+        isochrones_gdf["band_hours"].astype(float).tolist(),
+        positions_by_band,
+    ):
+        poi_count = len(positions)
+        poi_ids = poi_id_values[positions].tolist()
 
         coverage_percentage = (poi_count / total_pois * 100) if total_pois > 0 else 0.0
         band_label = format_time_display(band_hours)
 
-        # Vectorized production sum from POI metadata
         production_sum = (
-            float(
-                pd.Series(matches["metadata"])
-                .apply(lambda m: float((m or {}).get("Prod", 0) or 0))
-                .sum()
-            )
-            if "metadata" in matches.columns and not matches.empty
+            float(poi_production[positions].sum())
+            if poi_production is not None and poi_count
             else 0.0
         )
 
@@ -123,7 +274,9 @@ def compute_band_coverage(
             f"production_sum={production_sum:.1f}, max_production={max_production}, viable={viable}"
         )
 
-        coverage = BandCoverage(
+        # Built per band from already-typed values: model_construct skips
+        # re-validating every POI id
+        coverage = BandCoverage.model_construct(
             centroid_id=centroid_id,
             band_hours=band_hours,
             band_label=band_label,
@@ -136,12 +289,19 @@ def compute_band_coverage(
 
         coverage_results.append(coverage)
 
-    total_covered = len(set().union(*[c.poi_ids for c in coverage_results]))
+    # Covered ids in one allocation: unique positions across all bands, mapped
+    # to ids once, instead of unioning every band's id list
+    covered_positions = (
+        np.unique(np.concatenate(positions_by_band))
+        if positions_by_band
+        else np.empty(0, dtype=np.intp)
+    )
+    covered_ids = set(poi_id_values[covered_positions].tolist())
     logger.info(
-        f"Coverage analysis complete. Total unique POIs covered: {total_covered}/{total_pois}"
+        f"Coverage analysis complete. Total unique POIs covered: {len(covered_ids)}/{total_pois}"
     )
 
-    return coverage_results
+    return coverage_results, covered_ids
 
 
 def compute_centroid_coverage(
@@ -151,12 +311,9 @@ def compute_centroid_coverage(
     logger.debug("Computing centroid-level coverage statistics")
 
     # Group by centroid_id
-    centroid_groups = {}
+    centroid_groups: Dict[str, List[BandCoverage]] = defaultdict(list)
     for coverage in band_coverages:
-        centroid_id = coverage.centroid_id
-        if centroid_id not in centroid_groups:
-            centroid_groups[centroid_id] = []
-        centroid_groups[centroid_id].append(coverage)
+        centroid_groups[coverage.centroid_id].append(coverage)
 
     centroid_coverages = []
 
@@ -169,9 +326,9 @@ def compute_centroid_coverage(
         for band in bands:
             all_poi_ids.update(band.poi_ids)
 
-        # Find band with highest coverage
-        max_coverage_band = max(bands, key=lambda x: x.poi_count) if bands else None
-        max_band_label = max_coverage_band.band_label if max_coverage_band else None
+        # Find band with highest coverage (groups are never empty; ties go to
+        # the shortest band, as bands are already sorted)
+        max_band_label = max(bands, key=lambda x: x.poi_count).band_label
 
         logger.debug(
             f"Centroid {centroid_id}: {len(all_poi_ids)} unique POIs across {len(bands)} bands"
@@ -200,15 +357,34 @@ def compute_band_intersections(
     Fast intersection analysis inspired by legacy analyze_isochrone_intersections()
     Handles multi-way intersections efficiently using combinations
     """
+    matrix, _ = _compute_band_intersections(
+        isochrones_gdf, pois_gdf, min_overlap, max_combinations
+    )
+    return matrix
+
+
+def _compute_band_intersections(
+    isochrones_gdf: gpd.GeoDataFrame,
+    pois_gdf: gpd.GeoDataFrame,
+    min_overlap: int = 2,
+    max_combinations: int = 100,
+) -> Tuple[IntersectionMatrix, np.ndarray]:
+    """
+    compute_band_intersections, also returning a boolean bitmap over POI
+    positions marking those inside any reported intersection. Unions over it
+    are vectorized, instead of hashing every intersection's id strings.
+    """
+    in_intersection = np.zeros(len(pois_gdf), dtype=bool)
     if len(isochrones_gdf) < 2 or pois_gdf.empty:
         logger.warning("Insufficient data for intersection analysis")
-        return IntersectionMatrix(
+        empty = IntersectionMatrix(
             total_intersections=0,
             pairwise_intersections=[],
             multiway_intersections=[],
             max_overlap_count=0,
             total_intersection_area_km2=None,
         )
+        return empty, in_intersection
 
     logger.info(
         f"Computing intersections for {len(isochrones_gdf)} isochrones with min_overlap={min_overlap}"
@@ -216,9 +392,11 @@ def compute_band_intersections(
 
     # Prepare polygon data with labels (legacy format for speed)
     polys = []
-    for idx, row in isochrones_gdf.iterrows():
-        centroid_id = _extract_centroid_id(row, idx)
-        band_hours = float(row["band_hours"])
+    for centroid_id, band_hours, geometry in zip(
+        _extract_centroid_ids(isochrones_gdf),
+        isochrones_gdf["band_hours"].astype(float).tolist(),
+        isochrones_gdf.geometry.values,
+    ):
         band_label = format_time_display(band_hours)
         label = f"{centroid_id}_{band_label}"
 
@@ -227,44 +405,70 @@ def compute_band_intersections(
                 "label": label,
                 "centroid_id": centroid_id,
                 "band_hours": band_hours,
-                "geometry": cast(BaseGeometry, row.geometry),
+                "geometry": cast(BaseGeometry, geometry),
             }
         )
 
     pairwise_intersections = []
     multiway_intersections = []
     n_found = 0
+    tree = _poi_tree(pois_gdf, isochrones_gdf.crs)
+    poi_id_values = pois_gdf["id"].to_numpy()
 
-    # Use combinations to find all possible overlaps (legacy approach - very fast!)
-    for r in range(min_overlap, min(len(polys) + 1, max_combinations)):
-        logger.debug(f"Computing {r}-way intersections...")
+    # Intersection of every group computed so far, reused as the prefix of the
+    # next size up instead of re-intersecting all members per combination
+    inter_by_group: Dict[Tuple[int, ...], BaseGeometry] = {}
 
-        for combo in combinations(polys, r):
-            # Skip combinations from same centroid
-            centroid_ids = {p["centroid_id"] for p in combo}
-            if len(centroid_ids) < 2:
-                continue
+    # Only groups whose polygons all pairwise overlap can intersect
+    groups_by_size = _overlap_groups([p["geometry"] for p in polys])
+    centroid_of = [p["centroid_id"] for p in polys]
 
-            labels = [p["label"] for p in combo]
-            geoms = [p["geometry"] for p in combo]
-
-            # Fast intersection computation (legacy approach)
-            inter = geoms[0]
-            for g in geoms[1:]:
-                inter = inter.intersection(g)
-                if inter.is_empty:
-                    break
-
-            if inter.is_empty:
-                continue
-
-            # Count POIs in intersection
-            matches = pois_gdf[pois_gdf.geometry.within(inter)]
-            if len(matches) == 0:
-                continue
+    for r, groups in groups_by_size:
+        if r >= max_combinations:
+            break
+        if r < min_overlap:
+            continue
+        logger.debug(f"Computing {r}-way intersections...")
 
-            poi_count = len(matches)
-            poi_ids = matches["id"].tolist()
+        # Intersect every candidate group of this size first, so POI counts
+        # and areas are computed for all of them in batched calls
+        # Skip combinations from same centroid (plain index comparisons, no
+        # per-group dict lookups or sets)
+        mixed = [
+            combo_idx
+            for combo_idx in groups
+            if any(
+                centroid_of[i] != centroid_of[combo_idx[0]] for i in combo_idx[1:]
+            )
+        ]
+        inters = np.empty(len(mixed), dtype=object)
+        inters[:] = [
+            _group_intersection(combo_idx, polys, inter_by_group)
+            for combo_idx in mixed
+        ]
+        # One vectorized emptiness test instead of an is_empty call per group
+        level = [
+            ([polys[i] for i in combo_idx], inter)
+            for combo_idx, inter, empty in zip(
+                mixed, inters.tolist(), shapely.is_empty(inters).tolist()
+            )
+            if not empty
+        ]
+
+        # Count POIs in every intersection with one STRtree query; keep only
+        # those with POIs, up to the remaining combinations budget
+        poi_positions = _pois_within_many(tree, [inter for _, inter in level])
+        found = [
+            (combo, inter, positions)
+            for (combo, inter), positions in zip(level, poi_positions)
+            if len(positions)
+        ][: max_combinations - n_found]
+        areas_km2 = _calculate_areas_km2([inter for _, inter, _ in found])
+
+        for (combo, inter, positions), area_km2 in zip(found, areas_km2):
+            labels = [p["label"] for p in combo]
+            poi_count = len(positions)
+            poi_ids = poi_id_values[positions].tolist()
 
             logger.debug(
                 f"Intersection {' & '.join(labels)}: {poi_count} points inside"
@@ -275,13 +479,14 @@ def compute_band_intersections(
             intersection_label = " & ".join(labels)
             centroid_bands = [(p["centroid_id"], p["band_hours"]) for p in combo]
 
-            intersection = BandIntersection(
+            # Trusted internal values, so skip per-field validation
+            intersection = BandIntersection.model_construct(
                 intersection_id=intersection_id,
                 intersection_label=intersection_label,
                 centroid_bands=centroid_bands,
                 poi_count=poi_count,
                 poi_ids=poi_ids,
-                intersection_area_km2=_calculate_area_km2(inter),
+                intersection_area_km2=area_km2,
                 overlap_type=f"{r}-way" if r > 2 else "2-way",
             )
 
@@ -291,16 +496,14 @@ def compute_band_intersections(
             else:
                 multiway_intersections.append(intersection)
 
+            in_intersection[positions] = True
             n_found += 1
 
-            # Prevent computational explosion
-            if n_found >= max_combinations:
-                logger.warning(
-                    f"Reached maximum combinations limit ({max_combinations}), stopping"
-                )
-                break
-
+        # Prevent computational explosion
         if n_found >= max_combinations:
+            logger.warning(
+                f"Reached maximum combinations limit ({max_combinations}), stopping"
+            )
             break
 
     # Calculate summary statistics
@@ -320,13 +523,14 @@ def compute_band_intersections(
         f"Found {n_found} intersection regions: {len(pairwise_intersections)} 2-way, {len(multiway_intersections)} multi-way"
     )
 
-    return IntersectionMatrix(
+    matrix = IntersectionMatrix(
         total_intersections=total_intersections,
         pairwise_intersections=pairwise_intersections,
         multiway_intersections=multiway_intersections,
         max_overlap_count=max_overlap_count,
         total_intersection_area_km2=total_area if total_area > 0 else None,
     )
+    return matrix, in_intersection
 
 
 def compute_out_of_band_analysis(
@@ -342,17 +546,16 @@ def compute_out_of_band_analysis(
 
     # Use pre-computed covered IDs if available, otherwise compute them
     if covered_poi_ids is None:
-        covered_ids = set()
-        for idx, row in isochrones_gdf.iterrows():
-            geom = cast(BaseGeometry, row.geometry)
-            matches = pois_gdf[pois_gdf.geometry.within(geom)]
-            covered_ids.update(matches["id"].tolist())
+        tree = _poi_tree(pois_gdf, isochrones_gdf.crs)
+        _, positions = tree.query(isochrones_gdf.geometry.values, predicate="contains")
+        covered_ids = set(pois_gdf["id"].to_numpy()[np.unique(positions)].tolist())
     else:
         covered_ids = covered_poi_ids
 
-    # Find uncovered POIs
-    all_ids = set(pois_gdf["id"])
-    oob_ids = sorted(all_ids - covered_ids)
+    # Find uncovered POIs: set difference over a plain list of ids, not a
+    # per-element iteration of the pandas column
+    all_ids = set(pois_gdf["id"].tolist())
+    oob_ids = sorted(all_ids.difference(covered_ids))
 
     total_pois = len(pois_gdf)
     oob_count = len(oob_ids)
@@ -372,6 +575,7 @@ def compute_network_optimisation_index(
     intersection_matrix: IntersectionMatrix,
     oob_analysis: OutOfBandAnalysis,
     total_pois: int,
+    intersection_poi_count: Optional[int] = None,
 ) -> float:
     """
     Compute the Network Optimisation Index (NOI):
@@ -391,14 +595,18 @@ def compute_network_optimisation_index(
         X = sum(c.total_unique_pois for c in centroid_coverages)
 
         # Y: total POIs that appear in intersection (multi-coverage)
-        # Use unique POI IDs across all pairwise and multi-way intersections
-        intersection_poi_ids = set()
-        for inter in (
-            intersection_matrix.pairwise_intersections
-            + intersection_matrix.multiway_intersections
-        ):
-            intersection_poi_ids.update(inter.poi_ids)
-        Y = len(intersection_poi_ids)
+        # Use unique POI IDs across all pairwise and multi-way intersections,
+        # unless the caller already counted them (from a position bitmap)
+        if intersection_poi_count is not None:
+            Y = intersection_poi_count
+        else:
+            intersection_poi_ids = set()
+            for inter in (
+                intersection_matrix.pairwise_intersections
+                + intersection_matrix.multiway_intersections
+            ):
+                intersection_poi_ids.update(inter.poi_ids)
+            Y = len(intersection_poi_ids)
 
         # Z: total POIs outside all isochrones
         Z = oob_analysis.total_oob_pois
@@ -469,7 +677,7 @@ def compute_spatial_analysis(
 
     # Compute band coverage
     logger.debug("Computing band coverage...")
-    band_coverages = compute_band_coverage(
+    band_coverages, all_covered_poi_ids = _compute_band_coverage(
         isochrones_gdf, pois_gdf, max_production_by_centroid
     )
 
@@ -479,15 +687,10 @@ def compute_spatial_analysis(
 
     # Compute intersections
     logger.debug("Computing intersections...")
-    intersection_matrix = compute_band_intersections(
+    intersection_matrix, in_intersection = _compute_band_intersections(
         isochrones_gdf, pois_gdf, min_overlap, max_combinations
     )
 
-    # Collect all covered POI IDs from band coverages (computed once, reused below)
-    all_covered_poi_ids = set()
-    for coverage in band_coverages:
-        all_covered_poi_ids.update(coverage.poi_ids)
-
     # Compute out-of-band analysis (pass pre-computed covered IDs to skip redundant spatial joins)
     logger.debug("Computing out-of-band analysis...")
     oob_analysis = compute_out_of_band_analysis(
@@ -501,6 +704,11 @@ def compute_spatial_analysis(
         intersection_matrix=intersection_matrix,
         oob_analysis=oob_analysis,
         total_pois=len(pois),
+        # Count ids, not positions, so POIs sharing an id count once (as in
+        # the id-set path)
+        intersection_poi_count=len(
+            set(pois_gdf["id"].to_numpy()[in_intersection].tolist())
+        ),
     )
 
     # Calculate global statistics
@@ -538,16 +746,35 @@ def compute_spatial_analysis(
     )
 
 
-def _calculate_area_km2(geometry) -> float:
-    """Calculate area in km² for a geometry (rough approximation)"""
+@lru_cache(maxsize=1)
+def _mercator_transformer() -> Transformer:
+    """WGS84 -> Web Mercator transformer, built once and reused."""
+    return Transformer.from_crs(CRS_WGS84, CRS_WEB_MERCATOR, always_xy=True)
+
+
+def _calculate_areas_km2(geometries: List[BaseGeometry]) -> List[float]:
+    """
+    Areas in km² for many geometries (rough approximation in Web Mercator).
+    Coordinates are projected with one cached transformer, without building a
+    GeoSeries, and areas come from one vectorized shapely call.
+    """
+    if not geometries:
+        return []
+    transformer = _mercator_transformer()
+
+    def to_mercator(xy: np.ndarray) -> np.ndarray:
+        return np.column_stack(transformer.transform(xy[:, 0], xy[:, 1]))
+
+    geoms = np.empty(len(geometries), dtype=object)
+    geoms[:] = geometries
     try:
-        # Convert to a projected CRS for area calculation (using Web Mercator as approximation)
-        gdf_temp = gpd.GeoDataFrame([{"geometry": geometry}], crs="EPSG:4326")
-        gdf_projected = gdf_temp.to_crs(CRS_WEB_MERCATOR)
-        area_m2 = gdf_projected.geometry.area.iloc[0]
-        return area_m2 / 1_000_000  # Convert to km²
+        projected = shapely.transform(geoms, to_mercator)
+        return (shapely.area(projected) / 1_000_000).tolist()
     except Exception:
-        return 0.0
+        if len(geometries) == 1:
+            return [0.0]
+        # Isolate the failing geometry; the others keep their areas
+        return [area for g in geometries for area in _calculate_areas_km2([g])]
 
 
 # ---------- HELPER FUNCTIONS FOR API INTEGRATION ----------
@@ -1,6 +1,7 @@
 import os
 from abc import ABC, abstractmethod
-from typing import Any, Dict, List, Optional
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple
 
 import alphashape
 import networkx as nx
@@ -8,8 +9,12 @@ import numpy as np
 import osmnx as ox
 import requests
 from loguru import logger
+from requests.adapters import HTTPAdapter
 from shapely.geometry import MultiPoint, Point, shape
 
+# Connection pool size for HTTP providers; centroids are requested concurrently
+HTTP_POOL_MAXSIZE = 32
+
 
 def generate_time_bands(max_rho: float, num_bands: int = 1) -> List[float]:
     """
@@ -42,15 +47,56 @@ def generate_time_bands(max_rho: float, num_bands: int = 1) -> List[float]:
     return bands
 
 
-def extract_local_subgraph(G, lat, lon, max_dist_m):
-    import numpy as np
+def build_http_session(pool_maxsize: int = HTTP_POOL_MAXSIZE) -> requests.Session:
+    """
+    Build a pooled HTTP session (one connection pool per provider host).
+
+    Reusing keep-alive connections means N centroid requests pay the TCP/TLS
+    handshake once per pooled connection instead of once per request.
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=pool_maxsize)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+@lru_cache(maxsize=1)
+def get_http_session() -> requests.Session:
+    """Process-wide pooled session, so connections survive across requests."""
+    return build_http_session()
+
+
+def close_http_session() -> None:
+    """Close the shared session's pooled connections (e.g. on app shutdown)."""
+    if get_http_session.cache_info().currsize:
+        get_http_session().close()
+        get_http_session.cache_clear()
+
+
+def graph_node_coordinates(G) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Node ids and their x (lon) / y (lat) coordinates as parallel arrays."""
+    n = G.number_of_nodes()
+    node_data = G.nodes(data=True)
+    node_ids = np.array(list(G.nodes()))
+    xs = np.fromiter((data["x"] for _, data in node_data), dtype=np.float64, count=n)
+    ys = np.fromiter((data["y"] for _, data in node_data), dtype=np.float64, count=n)
+    return node_ids, xs, ys
+
+
+def extract_local_subgraph(G, lat, lon, max_dist_m, node_coords=None):
+    """
+    Subgraph of the nodes within max_dist_m of (lat, lon).
+
+    node_coords from graph_node_coordinates can be passed in so a graph shared
+    by many centroids is unpacked once; the distance filter is one vectorized
+    haversine pass and a boolean mask.
+    """
     from osmnx.distance import great_circle
 
-    node_ids = list(G.nodes())
-    node_x = np.array([G.nodes[n]["x"] for n in node_ids])
-    node_y = np.array([G.nodes[n]["y"] for n in node_ids])
+    node_ids, node_x, node_y = node_coords or graph_node_coordinates(G)
     dists = great_circle(lat, lon, node_y, node_x)
-    nodes_within_radius = [n for n, d in zip(node_ids, dists) if d <= max_dist_m]
+    nodes_within_radius = node_ids[dists <= max_dist_m].tolist()
     subgraph = G.subgraph(nodes_within_radius).copy()
     return subgraph
 
@@ -80,6 +126,8 @@ class OsmnxIsochroneProvider(IsochroneProvider):
     ) -> List[Dict[str, Any]]:
         results = []
         meters_per_minute = (travel_speed_kph * 1000) / 60  # Precompute
+        # A preloaded graph is shared by every centroid: unpack its nodes once
+        node_coords = graph_node_coordinates(G) if G is not None else None
 
         for c in centroids:
             lon, lat = float(c["lon"]), float(c["lat"])
@@ -93,7 +141,9 @@ class OsmnxIsochroneProvider(IsochroneProvider):
                 logger.info(
                     "Extracting subgraph for id={} from preloaded network", centroid_id
                 )
-                local_G = extract_local_subgraph(G, lat, lon, max_dist_m)
+                local_G = extract_local_subgraph(
+                    G, lat, lon, max_dist_m, node_coords
+                )
             else:
                 logger.info("Downloading OSMnx network for id={}", centroid_id)
                 local_G = ox.graph_from_point(
@@ -179,6 +229,7 @@ class Iso4AppIsochroneProvider(IsochroneProvider):
 
     def __init__(self, api_key: str):
         self.api_key = api_key
+        self.session = get_http_session()
 
     def compute(
         self,
@@ -238,7 +289,9 @@ class Iso4AppIsochroneProvider(IsochroneProvider):
                     params["speedLimit"] = float(speed_limit)
 
                 try:
-                    response = requests.get(self.BASE_URL, params=params, timeout=30)
+                    response = self.session.get(
+                        self.BASE_URL, params=params, timeout=30
+                    )
                     if response.status_code != 200:
                         msg = response.text.strip()[:200]
                         logger.error(
@@ -293,6 +346,7 @@ class MapboxIsochroneProvider(IsochroneProvider):
 
     def __init__(self, api_key: str):
         self.api_key = api_key
+        self.session = get_http_session()
 
     def compute(
         self,
@@ -323,7 +377,7 @@ class MapboxIsochroneProvider(IsochroneProvider):
             }
             url = f"{self.BASE_URL}/{profile}/{lon},{lat}"
             try:
-                response = requests.get(url, params=params, timeout=30)
+                response = self.session.get(url, params=params, timeout=30)
                 if response.status_code != 200:
                     msg = response.text.strip()[:200]
                     logger.error(
@@ -1,45 +1,244 @@
 """Core raster computation functions (pure logic, no web framework dependencies)."""
 
 import os
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from functools import lru_cache
 from itertools import combinations
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional, Set, Tuple
 
 import geopandas as gpd
+import networkx as nx
+import numpy as np
 import pandas as pd
 import rasterio
+import shapely
 from loguru import logger
-from rasterstats import zonal_stats
-from shapely import intersection_all
+from pyproj import CRS, Transformer
+from rasterio.features import geometry_mask
+from rasterio.transform import rowcol
+from rasterio.windows import Window
 
 from isolysis.constants import CRS_WEB_MERCATOR, CRS_WGS84, SQ_METERS_PER_KM2
+from isolysis.utils import WGS84
 
 
-def compute_stats_for_polygon(geom, raster_path: str) -> Dict[str, float]:
-    """Compute min, max, mean, std for a single polygon against a raster"""
-    stats_list = ["count", "min", "max", "mean", "median", "sum"]
-    try:
-        # Detect nodata value automatically from the raster
-        with rasterio.open(raster_path) as src:
-            nodata_value = src.nodata if src.nodata is not None else -9999
+STATS_LIST = ["count", "min", "max", "mean", "median", "sum"]
+DEFAULT_NODATA = -9999
+# GDAL block cache (MB) for windowed reads; overlapping windows hit the cache
+GDAL_CACHEMAX_MB = 512
+
+
+# Memory (bytes) that union windows may hold at once across all pool workers.
+# Each worker reads its batch's union window in one go only within its share
+# of this budget; beyond it, it reads per polygon
+MAX_BLOCK_BYTES = 2**30
+
+
+def _pool_size() -> int:
+    """Number of raster worker processes (one per CPU)."""
+    return os.cpu_count() or 1
+
+
+def _bounds_window(src, bounds) -> Tuple[int, int, int, int]:
+    """Unclipped (row_start, row_stop, col_start, col_stop) covering bounds."""
+    minx, miny, maxx, maxy = bounds
+    row_start, col_start = rowcol(src.transform, minx, maxy)
+    row_stop, col_stop = rowcol(src.transform, maxx, miny)
+    return row_start, row_stop + 1, col_start, col_stop + 1
+
+
+def _bounds_slices(src, bounds) -> Optional[Tuple[slice, slice]]:
+    """Row/column slices of the raster covering bounds, or None if outside."""
+    row_start, row_stop, col_start, col_stop = _bounds_window(src, bounds)
+    row_start, col_start = max(row_start, 0), max(col_start, 0)
+    row_stop, col_stop = min(row_stop, src.height), min(col_stop, src.width)
+    if row_stop <= row_start or col_stop <= col_start:
+        return None
+    return slice(row_start, row_stop), slice(col_start, col_stop)
+
+
+def _outside_pixel_count(src, geom, bounds, slices) -> int:
+    """
+    Pixels touched by the polygon (all_touched) that fall outside the raster
+    extent, counted over its unclipped bounding window.
+    """
+    row_start, row_stop, col_start, col_stop = _bounds_window(src, bounds)
+    if row_stop <= row_start or col_stop <= col_start:
+        return 0
+    touched = geometry_mask(
+        [geom],
+        out_shape=(row_stop - row_start, col_stop - col_start),
+        transform=src.window_transform(
+            Window(col_start, row_start, col_stop - col_start, row_stop - row_start)
+        ),
+        all_touched=True,
+        invert=True,
+    )
+    total = int(np.count_nonzero(touched))
+    if slices is None:
+        return total
+    rows, cols = slices
+    inside = touched[
+        rows.start - row_start : rows.stop - row_start,
+        cols.start - col_start : cols.stop - col_start,
+    ]
+    return total - int(np.count_nonzero(inside))
+
+
+def _polygon_stats(
+    src, geom, bounds, nodata: float, read, fill_outside: bool = False
+) -> Tuple[float, ...]:
+    """
+    Zonal stats (in STATS_LIST order) for one polygon over its bounding window
+    of band 1; NaN where undefined.
+
+    ``read(rows, cols)`` returns the band data for the window. Pixels touched
+    by the polygon (all_touched) that are not nodata/NaN are aggregated with
+    numpy. With fill_outside (rasters without a nodata value), pixels beyond
+    the raster extent count as 0, as rasterstats' boundless reads fill them.
+    """
+    empty = (0.0,) + (np.nan,) * (len(STATS_LIST) - 1)
 
-        stats = zonal_stats(
+    slices = _bounds_slices(src, bounds)
+    n_outside = _outside_pixel_count(src, geom, bounds, slices) if fill_outside else 0
+    if slices is None:
+        values = np.zeros(n_outside)
+    else:
+        data = read(*slices)
+        valid = geometry_mask(
             [geom],
-            raster_path,
-            stats=stats_list,
-            nodata=nodata_value,
+            out_shape=data.shape,
+            transform=src.window_transform(Window.from_slices(*slices)),
             all_touched=True,
-            geojson_out=False,
-        )[0]
+            invert=True,
+        )
+        valid &= data != nodata
+        if np.issubdtype(data.dtype, np.floating):
+            valid &= ~np.isnan(data)
+        values = data[valid]
+        if n_outside:
+            values = np.concatenate([values, np.zeros(n_outside, dtype=values.dtype)])
+
+    if not values.size:
+        return empty
+    count, vmin, vmax = values.size, values.min(), values.max()
+    mean, total = values.mean(dtype=np.float64), values.sum(dtype=np.float64)
+    # values is a fresh copy from the boolean mask, so the median may partition
+    # it in place instead of copying it again; done last for that reason
+    median = np.median(values, overwrite_input=True)
+    return (count, vmin, vmax, mean, median, total)
+
+
+def _window_reader(src, total_bounds):
+    """
+    Window reader for polygons inside total_bounds. Isochrones and their
+    intersections overlap heavily, so when the union window is small enough
+    it is read once and sliced; otherwise each window is read from disk.
+    """
+    block_slices = _bounds_slices(src, total_bounds)
+    if block_slices is not None:
+        rows, cols = block_slices
+        n_pixels = (rows.stop - rows.start) * (cols.stop - cols.start)
+        itemsize = np.dtype(src.dtypes[0]).itemsize
+        if n_pixels * itemsize <= MAX_BLOCK_BYTES // _pool_size():
+            block = src.read(1, window=Window.from_slices(rows, cols))
+
+            def read(r: slice, c: slice) -> np.ndarray:
+                return block[
+                    r.start - rows.start : r.stop - rows.start,
+                    c.start - cols.start : c.stop - cols.start,
+                ]
+
+            return read
+
+    return lambda r, c: src.read(1, window=Window.from_slices(r, c))
+
 
-        # Replace any None or negative no-data leftovers with 0 for population context
-        cleaned: Dict[str, float] = {
-            str(k): (0.0 if v is None or v < 0 else float(v)) for k, v in stats.items()
-        }
-        return cleaned
+def compute_stats_table(geoms, raster_path: str) -> np.ndarray:
+    """
+    Zonal stats for many polygons against a raster, as an (n, len(STATS_LIST))
+    float array. The raster is opened once (with a bounded GDAL block cache)
+    and the window covering all polygons is read once where it fits; each
+    polygon is then reduced with numpy over its own bounding window.
+
+    Undefined or negative no-data leftovers are replaced with 0 for
+    population context.
+    """
+    return _compute_stats_table(geoms, raster_path)[0]
 
+
+def _compute_stats_table(geoms, raster_path: str) -> Tuple[np.ndarray, bool]:
+    """
+    compute_stats_table plus whether the raster was read; a failed read is
+    logged and yields an all-zero table.
+    """
+    geoms = np.asarray(list(geoms), dtype=object)
+    table = np.zeros((len(geoms), len(STATS_LIST)))
+    ok = True
+    if not len(geoms):
+        return table, ok
+    try:
+        bounds = shapely.bounds(geoms)
+        with rasterio.Env(GDAL_CACHEMAX=GDAL_CACHEMAX_MB), rasterio.open(
+            raster_path
+        ) as src:
+            # Detect nodata value once per raster, not per polygon. Without one,
+            # pixels past the raster edge are read as 0 (rasterstats behaviour)
+            fill_outside = src.nodata is None
+            nodata = DEFAULT_NODATA if fill_outside else src.nodata
+            read = _window_reader(src, shapely.total_bounds(geoms))
+            # Rows are written straight into the preallocated table
+            for i, (geom, geom_bounds) in enumerate(zip(geoms, bounds)):
+                table[i] = _polygon_stats(
+                    src, geom, geom_bounds, nodata, read, fill_outside
+                )
     except Exception as e:
         logger.error(f"Failed raster stats for {raster_path}: {e}")
-        return {k: 0.0 for k in stats_list}
+        table[:] = 0.0
+        ok = False
+
+    # fmax treats NaN as missing, so NaN and negatives both become 0 in one pass
+    np.fmax(table, 0.0, out=table)
+    return table, ok
+
+
+def compute_stats_for_polygons(geoms, raster_path: str) -> List[Dict[str, float]]:
+    """Compute zonal stats for many polygons against a raster, one dict each."""
+    table = compute_stats_table(geoms, raster_path)
+    return [dict(zip(STATS_LIST, row)) for row in table.tolist()]
+
+
+def _stats_records(columns: Dict[str, Any], table: np.ndarray) -> List[Dict[str, Any]]:
+    """
+    Assemble result dicts from parallel columns plus a stats table in a single
+    tabular pass, instead of merging one dict per row.
+    """
+    frame = pd.DataFrame(columns)
+    for j, stat in enumerate(STATS_LIST):
+        frame[stat] = table[:, j]
+    return frame.to_dict("records")
+
+
+def compute_stats_for_polygon(geom, raster_path: str) -> Dict[str, float]:
+    """Compute min, max, mean, std for a single polygon against a raster"""
+    return compute_stats_for_polygons([geom], raster_path)[0]
+
+
+# Built once; pyproj Transformers are safe to share across threads (>= 3.1)
+_WGS84_TO_WEB_MERCATOR = Transformer.from_crs(
+    CRS_WGS84, CRS_WEB_MERCATOR, always_xy=True
+)
+
+
+def _web_mercator_areas_km2(geoms) -> np.ndarray:
+    """Project WGS84 geometries with the cached transformer and return km² areas."""
+
+    def _project(xy: np.ndarray) -> np.ndarray:
+        return np.column_stack(_WGS84_TO_WEB_MERCATOR.transform(xy[:, 0], xy[:, 1]))
+
+    return shapely.area(shapely.transform(geoms, _project)) / SQ_METERS_PER_KM2
 
 
 def compute_area_km2(geom) -> float:
@@ -48,11 +247,7 @@ def compute_area_km2(geom) -> float:
     Falls back to planar area if projection fails.
     """
     try:
-        area_km2 = (
-            gpd.GeoSeries([geom], crs=CRS_WGS84).to_crs(CRS_WEB_MERCATOR).area.iloc[0]
-            / SQ_METERS_PER_KM2
-        )
-        return float(area_km2)
+        return float(_web_mercator_areas_km2(geom))
     except Exception as e:
         logger.warning(f"Area projection failed: {e}")
         try:
@@ -61,132 +256,418 @@ def compute_area_km2(geom) -> float:
             return 0.0
 
 
-def compute_intersection_stats(iso_gdf: gpd.GeoDataFrame, raster_path: str):
+def overlapping_combinations(geoms) -> Dict[int, List[Tuple[int, ...]]]:
     """
-    Compute raster statistics for all valid intersections between isochrones.
-    Uses shapely.intersection_all for robust n-way geometric intersections.
+    Index combinations (size >= 2) whose geometries all pairwise intersect,
+    grouped by size.
+
+    An STRtree query finds the intersecting pairs in one vectorized call; the
+    candidate n-way groups are exactly the cliques of that overlap graph, so
+    combinations containing a disjoint pair are never enumerated.
     """
-    intersections = []
-    centroid_ids = list(iso_gdf["centroid_id"])
-    raster_name = os.path.basename(raster_path)
+    left, right = shapely.STRtree(geoms).query(geoms, predicate="intersects")
+    graph = nx.Graph()
+    graph.add_nodes_from(range(len(geoms)))
+    graph.add_edges_from((a, b) for a, b in zip(left.tolist(), right.tolist()) if a < b)
 
-    logger.info(
-        f"Starting intersection analysis for {len(centroid_ids)} centers "
-        f"on raster '{raster_name}'"
+    by_size: Dict[int, List[Tuple[int, ...]]] = defaultdict(list)
+    for clique in nx.enumerate_all_cliques(graph):
+        if len(clique) >= 2:
+            by_size[len(clique)].append(tuple(sorted(clique)))
+    for combos in by_size.values():
+        combos.sort()
+    return by_size
+
+
+def compute_areas_km2(geoms, crs=CRS_WGS84) -> List[float]:
+    """
+    Areas in square kilometers for many geometries, projected to EPSG:3857 in
+    one vectorized pass. Falls back to per-geometry areas if that fails.
+    """
+    geoms = list(geoms)
+    if not geoms:
+        return []
+    try:
+        if crs is None or CRS.from_user_input(crs) == WGS84:
+            return _web_mercator_areas_km2(np.asarray(geoms, dtype=object)).tolist()
+        areas = gpd.GeoSeries(geoms, crs=crs).to_crs(CRS_WEB_MERCATOR).area
+        return (areas / SQ_METERS_PER_KM2).tolist()
+    except Exception as e:
+        logger.warning(f"Batch area projection failed, falling back to per-row: {e}")
+        return [compute_area_km2(geom) for geom in geoms]
+
+
+def _bboxes_overlap(left: np.ndarray, right: np.ndarray) -> np.ndarray:
+    """Element-wise test (pure numpy on shapely.bounds) of bbox overlap."""
+    lb, rb = shapely.bounds(left), shapely.bounds(right)
+    return (
+        (lb[:, 0] <= rb[:, 2])
+        & (rb[:, 0] <= lb[:, 2])
+        & (lb[:, 1] <= rb[:, 3])
+        & (rb[:, 1] <= lb[:, 3])
     )
 
+
+def _intersect_pairs(left: np.ndarray, right: np.ndarray, combos) -> np.ndarray:
+    """
+    Element-wise intersection of two geometry arrays in one vectorized call.
+    If GEOS fails on any pair, retry pair by pair so only that combo is lost.
+    """
+    try:
+        return shapely.intersection(left, right)
+    except Exception:
+        out = np.empty(len(combos), dtype=object)
+        for i, (a, b, combo) in enumerate(zip(left, right, combos)):
+            try:
+                out[i] = shapely.intersection(a, b)
+            except Exception as e:
+                logger.error(f"Intersection failed for {combo}: {e}")
+                out[i] = None
+        return out
+
+
+def compute_intersections(
+    iso_gdf: gpd.GeoDataFrame,
+) -> Tuple[Dict[str, List[Any]], List[Any]]:
+    """
+    All non-empty n-way intersections between isochrones. They do not depend
+    on any raster, so callers compute them once and reuse them per raster.
+
+    n-way intersections are built incrementally: every r-way combo is its
+    (r-1)-way prefix intersected with its last member, computed for all combos
+    of a given size in one vectorized shapely.intersection call.
+
+    Returns the result columns (scope, centroid_id, type, area_km2) and the
+    matching intersection geometries.
+    """
+    inter_geoms = []
+    inter_ids: List[str] = []
+    inter_types: List[str] = []
+    centroid_ids = list(iso_gdf["centroid_id"])
+
+    logger.info(f"Starting intersection analysis for {len(centroid_ids)} centers")
+
+    # Positional geometry array: combos index it directly instead of masking
+    # the frame by centroid_id for every member of every combo
+    geom_values = np.asarray(iso_gdf.geometry.values)
+
+    # Only groups whose members all overlap can have a non-empty intersection
+    candidates = overlapping_combinations(geom_values)
+
+    # Non-empty intersection of every combo seen so far, reused as the prefix
+    # of the next size up
+    inter_by_combo: Dict[Tuple[int, ...], Any] = {}
+    # Running per-size counts for logging, instead of re-scanning the results
+    valid_by_r: Dict[int, int] = {}
+
     for r in range(2, len(centroid_ids) + 1):
-        combos = list(combinations(centroid_ids, r))
+        combos = candidates[r]
+        if r > 2:
+            # An r-way intersection is empty as soon as any of its (r-1)-way
+            # sub-combos is, so only extend groups whose sub-combos all survived
+            combos = [
+                c
+                for c in combos
+                if all(sub in inter_by_combo for sub in combinations(c, r - 1))
+            ]
+        if not combos:
+            # Groups grow one member at a time: no r-way group, no larger ones
+            break
         logger.debug(
             f"Computing {r}-way intersections across {len(combos)} combinations"
         )
 
-        for combo in combos:
-            geoms = [
-                iso_gdf.loc[iso_gdf["centroid_id"] == cid, "geometry"].values[0]
-                for cid in combo
-            ]
+        members = np.asarray(combos)
+        if r == 2:
+            prefixes = geom_values[members[:, 0]]
+        else:
+            prefixes = np.empty(len(combos), dtype=object)
+            prefixes[:] = [inter_by_combo[c[:-1]] for c in combos]
+        lasts = geom_values[members[:, -1]]
 
-            try:
-                inter_geom = intersection_all(geoms)
-            except Exception as e:
-                logger.error(f"Intersection failed for {combo}: {e}")
-                continue
-
-            if inter_geom is None or inter_geom.is_empty:
-                logger.debug(f"No intersection geometry for {combo}")
-                continue
-
-            # Compute area in km² (project to EPSG:3857)
-            area_km2 = compute_area_km2(inter_geom)
-            stats = compute_stats_for_polygon(inter_geom, raster_path)
-            intersections.append(
-                {
-                    "scope": "intersection",
-                    "centroid_id": " & ".join(combo),
-                    "type": f"{r}-way",
-                    "area_km2": area_km2,
-                    **stats,
-                }
+        # Envelope test first: a prefix whose bbox misses the last member's
+        # cannot intersect it, so GEOS only runs on the pairs that pass
+        results = np.full(len(combos), None, dtype=object)
+        hits = np.flatnonzero(_bboxes_overlap(prefixes, lasts))
+        if len(hits):
+            results[hits] = _intersect_pairs(
+                prefixes[hits], lasts[hits], [combos[i] for i in hits]
             )
 
-        logger.info(
-            f"Completed {r}-way intersections -> "
-            f"{len([i for i in intersections if i['type'] == f'{r}-way'])} valid"
-        )
+        # Filter empties with one array mask; only survivors get labelled
+        empty = shapely.is_missing(results) | shapely.is_empty(results)
+        kept = np.flatnonzero(~empty)
+        if len(kept) < len(combos):
+            logger.debug(f"{len(combos) - len(kept)} empty {r}-way intersections")
+
+        for k in kept.tolist():
+            inter_by_combo[combos[k]] = results[k]
+            inter_ids.append(" & ".join(centroid_ids[i] for i in combos[k]))
+        inter_geoms.extend(results[kept])
+        inter_types.extend([f"{r}-way"] * len(kept))
+
+        valid_by_r[r] = len(kept)
+        logger.info(f"Completed {r}-way intersections -> {len(kept)} valid")
+
+    # One batched projection (km², EPSG:3857) over every intersection polygon
+    areas_km2 = compute_areas_km2(inter_geoms)
 
-    total_area = sum(i.get("area_km2", 0) or 0 for i in intersections)
     logger.info(
-        f"Finished intersection analysis -> total={len(intersections)} "
-        f"({sum(1 for i in intersections if i['type'] == '2-way')} two-way, "
-        f"{sum(1 for i in intersections if '3-way' in i['type'])} three-way+), "
-        f"aggregate area={total_area:.3f} km2"
+        f"Finished intersection analysis -> total={len(inter_geoms)} "
+        f"({valid_by_r.get(2, 0)} two-way, "
+        f"{sum(n for r, n in valid_by_r.items() if r >= 3)} three-way+), "
+        f"aggregate area={sum(areas_km2):.3f} km2"
     )
 
-    return intersections
+    columns = {
+        "scope": ["intersection"] * len(inter_geoms),
+        "centroid_id": inter_ids,
+        "type": inter_types,
+        "area_km2": areas_km2,
+    }
+    return columns, inter_geoms
+
+
+def compute_intersection_stats(iso_gdf: gpd.GeoDataFrame, raster_path: str):
+    """Compute raster statistics for all valid intersections between isochrones."""
+    columns, inter_geoms = compute_intersections(iso_gdf)
+    return _stats_records(columns, compute_stats_table(inter_geoms, raster_path))
+
+
+NAME_COLUMNS = ["centroid_id", "name", "NAME_3", "NAME_2", "NAME_1"]
+
+
+def feature_names(gdf: gpd.GeoDataFrame) -> List[Any]:
+    """
+    Label each feature with its first non-empty name column, falling back to
+    Feature_{index}. Resolved column-wise rather than row by row.
+    """
+    names = pd.Series([f"Feature_{idx}" for idx in gdf.index], index=gdf.index)
+    # Lowest priority first, so higher-priority columns overwrite it
+    for col in reversed(NAME_COLUMNS):
+        if col in gdf.columns:
+            values = gdf[col]
+            names = names.mask(values.notna() & values.astype(bool), values)
+    return names.tolist()
+
+
+# Smallest geometry batch worth shipping to a worker process
+MIN_BATCH_SIZE = 16
+
+
+def _stats_table_batch(
+    geoms_wkb: List[bytes], raster_path: str
+) -> Tuple[np.ndarray, bool]:
+    """
+    Stats table for a batch of WKB geometries (runs in a worker process), and
+    whether the raster was read.
+    """
+    return _compute_stats_table(shapely.from_wkb(geoms_wkb), raster_path)
+
+
+@lru_cache(maxsize=1)
+def get_process_pool() -> ProcessPoolExecutor:
+    """Process-wide worker pool for raster stats, so workers survive requests."""
+    return ProcessPoolExecutor(max_workers=_pool_size())
+
+
+def shutdown_process_pool() -> None:
+    """Stop the shared worker pool's processes (e.g. on app shutdown)."""
+    if get_process_pool.cache_info().currsize:
+        get_process_pool().shutdown(cancel_futures=True)
+        get_process_pool.cache_clear()
+
+
+def _pooled_tables(
+    batches: List[List[bytes]], raster_paths: List[str]
+) -> List[List[Tuple[np.ndarray, bool]]]:
+    """
+    Stats tables and read flags per raster and batch from the shared worker
+    pool, in input order. A crashed worker breaks the whole pool, so a broken
+    pool is replaced and the work retried once; if that also breaks, it runs
+    in this process.
+    """
+    for attempt in range(2):
+        pool = get_process_pool()
+        try:
+            futures = [
+                [pool.submit(_stats_table_batch, batch, path) for batch in batches]
+                for path in raster_paths
+            ]
+            # Keep raster and geometry order regardless of completion order
+            return [[future.result() for future in row] for row in futures]
+        except BrokenProcessPool as e:
+            logger.error(f"Raster worker pool broke (attempt {attempt + 1}): {e}")
+            pool.shutdown(wait=False, cancel_futures=True)
+            get_process_pool.cache_clear()
+
+    logger.warning("Computing raster stats in-process after repeated pool failures")
+    return [
+        [_stats_table_batch(batch, path) for batch in batches] for path in raster_paths
+    ]
+
+
+def _records_per_raster(
+    geoms,
+    columns: Dict[str, List[Any]],
+    raster_paths: List[str],
+    failed: Optional[Set[str]] = None,
+) -> List[List[Dict[str, Any]]]:
+    """
+    One stats pass per raster over the same geometries and result columns.
+
+    Each raster's geometries are split into batches so that rasters, and
+    large geometry sets within one raster, spread over the shared worker
+    pool. Geometries cross the process boundary as WKB and only the numeric
+    stats tables come back; records are assembled here, in input order.
+    Paths of rasters that could not be read are added to ``failed``.
+    """
+    geoms_wkb = shapely.to_wkb(np.asarray(geoms, dtype=object)).tolist()
+    workers = _pool_size()
+    n_batches = max(
+        1,
+        min(-(-workers // len(raster_paths)), len(geoms_wkb) // MIN_BATCH_SIZE),
+    )
+    bounds = np.linspace(0, len(geoms_wkb), n_batches + 1).astype(int).tolist()
+    batches = [geoms_wkb[start:stop] for start, stop in zip(bounds, bounds[1:])]
+
+    for path in raster_paths:
+        logger.info(f"Processing raster: {os.path.basename(path)}")
+
+    if len(raster_paths) * len(batches) == 1:
+        tables = [[_stats_table_batch(geoms_wkb, raster_paths[0])]]
+    else:
+        tables = _pooled_tables(batches, raster_paths)
+
+    if failed is not None:
+        failed.update(
+            path
+            for path, row in zip(raster_paths, tables)
+            if not all(ok for _, ok in row)
+        )
+    return [
+        _stats_records(columns, np.vstack([table for table, _ in row]))
+        for row in tables
+    ]
+
+
+def _raster_exists(raster: Dict[str, Any]) -> bool:
+    """Use the caller's "exists" flag when present, else stat the file."""
+    exists = raster.get("exists")
+    if exists is None:
+        exists = os.path.exists(raster["path"])
+    if not exists:
+        logger.error(f"Raster not found: {raster['path']}")
+    return exists
 
 
 def compute_stats_for_geometries(
-    gdf: gpd.GeoDataFrame, rasters: List[Dict[str, str]], scope: str
+    gdf: gpd.GeoDataFrame,
+    rasters: List[Dict[str, Any]],
+    scope: str,
+    failed: Optional[Set[str]] = None,
 ) -> List[Dict[str, Any]]:
-    """Generic helper to compute zonal stats for a GeoDataFrame across rasters."""
-    results = []
+    """
+    Generic helper to compute zonal stats for a GeoDataFrame across rasters.
+    Paths of rasters that could not be read are added to ``failed``.
+    """
+    raster_paths = [r["path"] for r in rasters if _raster_exists(r)]
+    if not raster_paths:
+        return []
+
+    logger.debug(f"Boundary GDF columns: {gdf.columns.tolist()}")
 
     # Project once and compute all areas in batch (avoids per-row GeoSeries construction)
-    try:
-        areas_km2 = gdf.to_crs(CRS_WEB_MERCATOR).geometry.area / SQ_METERS_PER_KM2
-    except Exception as e:
-        logger.warning(f"Batch area projection failed, falling back to per-row: {e}")
-        areas_km2 = None
+    names = feature_names(gdf)
+    columns = {
+        "scope": [scope] * len(names),
+        "centroid_id": names,
+        "type": ["polygon" if scope == "boundary" else "1-way"] * len(names),
+        "area_km2": compute_areas_km2(gdf.geometry.values, crs=gdf.crs),
+    }
+    per_raster = _records_per_raster(
+        gdf.geometry.values, columns, raster_paths, failed
+    )
+    return [record for records in per_raster for record in records]
 
-    for raster in rasters:
-        raster_path = raster["path"]
-        if not os.path.exists(raster_path):
-            logger.error(f"Raster not found: {raster_path}")
-            continue
 
-        logger.info(f"Processing raster: {os.path.basename(raster_path)}")
-        logger.debug(f"Boundary GDF columns: {gdf.columns.tolist()}")
-        for idx, row in gdf.iterrows():
-            geom = row.geometry
-            stats = compute_stats_for_polygon(geom, raster_path)
-            area_km2 = (
-                float(areas_km2[idx])
-                if areas_km2 is not None
-                else compute_area_km2(geom)
-            )
-            name = (
-                row.get("centroid_id")
-                or row.get("name")
-                or row.get("NAME_3")
-                or row.get("NAME_2")
-                or row.get("NAME_1")
-                or f"Feature_{idx}"
-            )
-            results.append(
-                {
-                    "scope": scope,
-                    "centroid_id": name,
-                    "type": "polygon" if scope == "boundary" else "1-way",
-                    "area_km2": area_km2,
-                    **stats,
-                }
-            )
-    return results
+def compute_isochrone_stats(
+    iso_gdf: gpd.GeoDataFrame,
+    rasters: List[Dict[str, Any]],
+    failed: Optional[Set[str]] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Per-isochrone and intersection stats for every raster.
+
+    Intersection geometries do not depend on the raster, so they are computed
+    once; each raster then gets a single stats pass over the isochrones and
+    their intersections together.
+
+    Output layout: every raster's isochrone rows, then every raster's
+    intersection rows. Missing rasters contribute zero-stat intersection rows.
+    Paths of rasters that could not be read are added to ``failed``.
+    """
+    n_iso = len(iso_gdf)
+    names = feature_names(iso_gdf)
+    iso_columns = {
+        "scope": ["isochrone"] * n_iso,
+        "centroid_id": names,
+        "type": ["1-way"] * n_iso,
+        "area_km2": compute_areas_km2(iso_gdf.geometry.values, crs=iso_gdf.crs),
+    }
+
+    # Intersections need at least two isochrones
+    if n_iso >= 2:
+        inter_columns, inter_geoms = compute_intersections(iso_gdf)
+    else:
+        inter_columns = {key: [] for key in iso_columns}
+        inter_geoms = []
+
+    exists = [_raster_exists(r) for r in rasters]
+    raster_paths = [r["path"] for r, ok in zip(rasters, exists) if ok]
+    columns = {key: iso_columns[key] + inter_columns[key] for key in iso_columns}
+    geoms = list(iso_gdf.geometry.values) + inter_geoms
+    per_raster = iter(
+        _records_per_raster(geoms, columns, raster_paths, failed)
+        if raster_paths
+        else []
+    )
+
+    missing_inter = _stats_records(
+        inter_columns, np.zeros((len(inter_geoms), len(STATS_LIST)))
+    )
+    iso_rows: List[Dict[str, Any]] = []
+    inter_rows: List[Dict[str, Any]] = []
+    for ok in exists:
+        if not ok:
+            inter_rows.extend(dict(record) for record in missing_inter)
+            continue
+        records = next(per_raster)
+        iso_rows.extend(records[:n_iso])
+        inter_rows.extend(records[n_iso:])
+    return iso_rows + inter_rows
 
 
 def log_summary(results: List[Dict[str, Any]], label: str = "Results"):
-    """Log descriptive stats summary similar to df.describe()."""
+    """
+    Log descriptive stats summary similar to df.describe().
+
+    The summary is built lazily: the pandas work only runs if a sink will
+    actually emit INFO records.
+    """
     if not results:
         logger.warning(f"{label}: no results to summarize.")
         return
 
+    logger.opt(lazy=True).info("{}", lambda: _summary_text(results, label))
+
+
+def _summary_text(results: List[Dict[str, Any]], label: str) -> str:
+    """Render the describe() table for log_summary."""
     df = pd.DataFrame(results)
     numeric_cols = df.select_dtypes(include="number")
     if numeric_cols.empty:
-        logger.info(f"{label}: no numeric columns to summarize.")
-        return
+        return f"{label}: no numeric columns to summarize."
 
     summary = numeric_cols.describe().T
-    logger.info(f"{label} summary (n={len(df)})")
-    logger.info("\n" + summary.round(3).to_string())
+    return f"{label} summary (n={len(df)})\n" + summary.round(3).to_string()
@@ -6,9 +6,13 @@ from typing import Any, Dict, List
 
 import geopandas as gpd
 from loguru import logger
+from pyproj import CRS
 
 from isolysis.constants import CRS_WGS84
 
+# Built once at import; passing a CRS object avoids re-parsing the EPSG string per frame
+WGS84 = CRS.from_user_input(CRS_WGS84)
+
 
 def format_time(seconds: float) -> str:
     """
@@ -44,13 +48,15 @@ def log_timing(func):
     return wrapper
 
 
-def harmonize_isochrones_columns(records: List[Dict[str, Any]]) -> gpd.GeoDataFrame:
+def harmonize_isochrones_columns(
+    records: List[Dict[str, Any]], crs: CRS = WGS84
+) -> gpd.GeoDataFrame:
     """
     Convert a list of isochrone dicts from any provider to a GeoDataFrame
     with a standardized 'band_hours' column (float) and 'geometry'.
     """
     # Make DataFrame
-    gdf = gpd.GeoDataFrame(records, crs=CRS_WGS84)
+    gdf = gpd.GeoDataFrame(records, crs=crs)
 
     # Try to handle various possible band columns
     if "band_hours" not in gdf.columns:
@@ -83,9 +83,8 @@ def main():
     result = compute_spatial_analysis(gdf, pois)
 
     # Log results
-    output_json = json.dumps(
-        result.model_dump(), indent=2, ensure_ascii=False, default=str
-    )
+    # Serialized by pydantic-core directly, without an intermediate dict tree
+    output_json = result.model_dump_json(indent=2)
     logger.info(
         "Isochrone coverage analysis result:\n{}",
         output_json,
@@ -9,6 +9,7 @@ from st_utils import (
     build_iso4app_payload_options,
     call_api,
     format_time_display,
+    get_cached_feature_group,
     get_coordinates_center,
     get_map_center,
     handle_coordinate_upload,
@@ -87,6 +88,50 @@ def _build_coverage_by_center() -> dict:
     return coverage_by_center
 
 
+def build_coordinates_layer(coordinates) -> fl.GeoJson:
+    """
+    Uploaded points as a single GeoJson layer of circle markers: one folium
+    object and one embedded FeatureCollection instead of a CircleMarker (and
+    popup) per point.
+    """
+    na = t("tooltip.na")
+    features = [
+        {
+            "type": "Feature",
+            "geometry": {"type": "Point", "coordinates": [coord.lon, coord.lat]},
+            "properties": {
+                "label": coord.name or coord.id or "Unknown",
+                "lat": f"{coord.lat:.5f}",
+                "lon": f"{coord.lon:.5f}",
+                "region": coord.region or na,
+                "municipality": coord.municipality or na,
+            },
+        }
+        for coord in coordinates
+    ]
+    return fl.GeoJson(
+        {"type": "FeatureCollection", "features": features},
+        marker=fl.CircleMarker(radius=3, fill=True),
+        style_function=lambda x: {
+            "color": "black",
+            "weight": 1,
+            "fillColor": "grey",
+            "fillOpacity": 0.5,
+            "opacity": 0.8,
+        },
+        tooltip=fl.GeoJsonTooltip(fields=["label"], labels=False),
+        popup=fl.GeoJsonPopup(
+            fields=["lat", "lon", "region", "municipality"],
+            aliases=[
+                t("tooltip.lat"),
+                t("tooltip.lon"),
+                t("tooltip.region"),
+                t("tooltip.municipality"),
+            ],
+        ),
+    )
+
+
 def build_feature_group():
     """Build feature group with all current elements (fragment for auto-refresh)"""
     fg = create_feature_group()
@@ -159,26 +204,8 @@ def build_feature_group():
         fg.add_child(marker)
 
     # Add uploaded coordinates
-    if "uploaded_coordinates" in st.session_state:
-        for coord in st.session_state.uploaded_coordinates:
-            label = coord.name or coord.id or "Unknown"
-            circle_marker = fl.CircleMarker(
-                location=[coord.lat, coord.lon],
-                radius=3,
-                popup=f"""
-                <b>{t("tooltip.lat")}</b>: {coord.lat:.5f}<br>
-                <b>{t("tooltip.lon")}</b>: {coord.lon:.5f}<br>
-                <b>{t("tooltip.region")}</b>: {coord.region or t("tooltip.na")}<br>
-                <b>{t("tooltip.municipality")}</b>: {coord.municipality or t("tooltip.na")}
-                """,
-                tooltip=label,
-                color="black",
-                weight=1,
-                fillColor="grey",
-                fillOpacity=0.5,
-                opacity=0.8,
-            )
-            fg.add_child(circle_marker)
+    if st.session_state.get("uploaded_coordinates"):
+        fg.add_child(build_coordinates_layer(st.session_state.uploaded_coordinates))
 
     # Add isochrones with per-center colors
     for idx, (center_name, isochrone_data) in enumerate(
@@ -217,10 +244,45 @@ def build_feature_group():
     return fg
 
 
+def _feature_group_state() -> tuple:
+    """
+    Snapshot of everything build_feature_group() reads. Centers are mutated in
+    place, so their values are copied; uploaded coordinates are keyed by the
+    upload's file_id; the other entries are replaced on update, so their
+    identities are enough.
+    """
+    return (
+        st.session_state.lang,
+        tuple(
+            (name, tuple(sorted(coords.items())))
+            for name, coords in st.session_state.centers.items()
+        ),
+        tuple(st.session_state.isochrones.values()),
+        st.session_state.get("uploaded_file_id"),
+        st.session_state.get("analysis_result"),
+    )
+
+
+def get_feature_group():
+    """Reuse the last feature group while the map state is unchanged."""
+    return get_cached_feature_group(
+        _feature_group_state(), _same_state, build_feature_group
+    )
+
+
+def _same_state(old: tuple, new: tuple) -> bool:
+    """Compare snapshots: values for lang/centers/upload, identity for the rest."""
+    if old[:2] != new[:2] or len(old[2]) != len(new[2]) or old[3] != new[3]:
+        return False
+    return all(a is b for a, b in zip(old[2], new[2])) and old[4] is new[4]
+
+
 def draw_map():
     """Draw the map with all current elements"""
     m = create_base_map()
-    fg = build_feature_group()
+    # Rebuilding every marker/GeoJson layer on each widget rerun is the costly
+    # part of drawing; only do it when the underlying state changed
+    fg = get_feature_group()
 
     map_center = get_map_center()
 
@@ -246,13 +308,19 @@ def handle_coordinate_upload_sidebar():
     )
 
     if uploaded_file is not None:
-        coordinates = handle_coordinate_upload(uploaded_file)
-        if coordinates:
-            st.success(t("upload.success", count=len(coordinates)))
-            st.session_state.uploaded_coordinates = coordinates
+        # The parser is st.cache_data, which returns a fresh copy on every
+        # rerun; only take it when the upload changed, so the stored list
+        # stays the same object between reruns
+        if st.session_state.get("uploaded_file_id") != uploaded_file.file_id:
+            coordinates = handle_coordinate_upload(uploaded_file)
             if coordinates:
+                st.session_state.uploaded_coordinates = coordinates
+                st.session_state.uploaded_file_id = uploaded_file.file_id
                 coord_center = get_coordinates_center(coordinates)
                 st.session_state.coord_center = coord_center
+        if st.session_state.get("uploaded_coordinates"):
+            count = len(st.session_state.uploaded_coordinates)
+            st.success(t("upload.success", count=count))
 
     # Add remove button if we have uploaded coordinates
     if (
@@ -261,6 +329,7 @@ def handle_coordinate_upload_sidebar():
     ):
         if st.button(t("upload.remove_btn")):
             del st.session_state.uploaded_coordinates
+            st.session_state.pop("uploaded_file_id", None)
             if "coord_center" in st.session_state:
                 del st.session_state.coord_center
             st.success(t("upload.removed"))
@@ -513,8 +582,7 @@ def render_center_controls():
         with col2:
             if st.button(t("centers.undo")):
                 if st.session_state.centers:
-                    last_key = list(st.session_state.centers.keys())[-1]
-                    del st.session_state.centers[last_key]
+                    last_key, _ = st.session_state.centers.popitem()
                     if last_key in st.session_state.isochrones:
                         del st.session_state.isochrones[last_key]
                     st.success(t("centers.removed", name=last_key))
@@ -908,31 +976,54 @@ def render_export_button(analysis):
     date_suffix = datetime.now().strftime("%y%m%d")
     filename = f"coverage_export_{date_suffix}.csv"
 
-    # Prepare serializable inputs for the cached function
-    coverage_analysis_tuple = tuple(
-        {
-            "centroid_id": cov.get("centroid_id"),
-            "bands": tuple(
-                {"poi_ids": tuple(b.get("poi_ids", []))} for b in cov.get("bands", [])
-            ),
-        }
-        for cov in analysis.get("coverage_analysis", [])
-    )
-    coords_tuple = tuple(
-        {
-            "id": c.id,
-            "name": c.name,
-            "lat": c.lat,
-            "lon": c.lon,
-            "region": c.region,
-            "municipality": c.municipality,
-            "metadata": dict(c.metadata) if c.metadata else None,
-        }
-        for c in st.session_state.uploaded_coordinates
-    )
+    # Reuse the CSV while the analysis, uploaded file and centers are
+    # unchanged, so reruns skip rebuilding (and hashing) the per-coordinate
+    # inputs. The upload is keyed by file_id: the parsed list is a fresh copy
+    # whenever the upload is re-read, so its identity says nothing
+    coords = st.session_state.uploaded_coordinates
+    file_id = st.session_state.get("uploaded_file_id")
     center_ids_tuple = tuple(st.session_state.centers.keys())
-
-    csv_data = _build_csv(coverage_analysis_tuple, coords_tuple, center_ids_tuple)
+    cached = st.session_state.get("_export_csv_cache")
+    if (
+        cached is not None
+        and cached[0] is analysis
+        and cached[1] == file_id
+        and cached[2] == center_ids_tuple
+    ):
+        csv_data = cached[3]
+    else:
+        # Prepare serializable inputs for the cached function
+        coverage_analysis_tuple = tuple(
+            {
+                "centroid_id": cov.get("centroid_id"),
+                "bands": tuple(
+                    {"poi_ids": tuple(b.get("poi_ids", []))}
+                    for b in cov.get("bands", [])
+                ),
+            }
+            for cov in analysis.get("coverage_analysis", [])
+        )
+        coords_tuple = tuple(
+            {
+                "id": c.id,
+                "name": c.name,
+                "lat": c.lat,
+                "lon": c.lon,
+                "region": c.region,
+                "municipality": c.municipality,
+                "metadata": dict(c.metadata) if c.metadata else None,
+            }
+            for c in coords
+        )
+        csv_data = _build_csv(
+            coverage_analysis_tuple, coords_tuple, center_ids_tuple
+        ).encode()
+        st.session_state._export_csv_cache = (
+            analysis,
+            file_id,
+            center_ids_tuple,
+            csv_data,
+        )
 
     st.download_button(
         label=t("export.btn"),
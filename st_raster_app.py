@@ -9,8 +9,8 @@ from io import BytesIO
 
 import folium as fl
 import geopandas as gpd
+import matplotlib
 import matplotlib.colors
-import matplotlib.pyplot as plt
 import numpy as np
 import rasterio
 import streamlit as st
@@ -23,6 +23,7 @@ from st_utils import (
     call_api,
     format_time_display,
     get_band_color,
+    get_cached_feature_group,
     get_map_center,
 )
 from translations import get_selectbox_options, t
@@ -79,29 +80,39 @@ def read_raster(uploaded_file):
 def read_boundary(uploaded_file):
     """
     Safely read boundary file (GPKG, GeoJSON, or ZIP shapefile).
-    Writes GeoPackage to a temporary file because GDAL needs a real path.
+    Parsing is cached on the file bytes, so reruns skip GDAL entirely.
     """
     file_bytes = load_uploaded_file(uploaded_file)
+    gdf = parse_boundary(file_bytes, uploaded_file.name)
+    if gdf is None:
+        st.warning(t("raster.unsupported_boundary"))
+    return gdf
+
 
-    if uploaded_file.name.endswith(".gpkg"):
+@st.cache_data(show_spinner=False)
+def parse_boundary(file_bytes: bytes, name: str):
+    """
+    Parse boundary bytes into a GeoDataFrame, keyed on content and file name.
+    Writes GeoPackage to a temporary file because GDAL needs a real path.
+    """
+    if name.endswith(".gpkg"):
         with tempfile.NamedTemporaryFile(suffix=".gpkg", delete=False) as tmp:
             tmp.write(file_bytes)
             tmp_path = tmp.name
         gdf = gpd.read_file(tmp_path)
         return gdf
 
-    if uploaded_file.name.endswith(".geojson"):
+    if name.endswith(".geojson"):
         gdf = gpd.read_file(BytesIO(file_bytes))
         return gdf
 
-    if uploaded_file.name.endswith(".zip"):
+    if name.endswith(".zip"):
         with tempfile.NamedTemporaryFile(suffix=".zip", delete=False) as tmp:
             tmp.write(file_bytes)
             tmp_path = tmp.name
         gdf = gpd.read_file(f"zip://{tmp_path}")
         return gdf
 
-    st.warning(t("raster.unsupported_boundary"))
     return None
 
 
@@ -121,7 +132,7 @@ def raster_to_png_path(_file_bytes: bytes, _name: str, colormap="viridis"):
     data = np.where(mask, np.nan, data)
     vmin, vmax = np.nanmin(data), np.nanmax(data)
     norm = matplotlib.colors.Normalize(vmin=vmin, vmax=vmax)
-    cmap = plt.get_cmap(colormap)
+    cmap = matplotlib.colormaps[colormap]
     rgba_img = cmap(norm(data))
     rgba_img[..., 3] = np.where(np.isnan(data), 0, 1)
 
@@ -373,16 +384,16 @@ def process_isochrone(center_name, lat, lon, rho):
 # ---------------------------
 # MAP + INTERACTION
 # ---------------------------
-def draw_map():
-    """Draw the folium map and update dynamically using st_folium's new parameters."""
-    m = create_base_map()
+def build_feature_group():
+    """Build the dynamic layer: isochrones, boundary and first raster overlay."""
     fg = fl.FeatureGroup(name="Isochrones and Boundary")
 
     # --- Add isochrones dynamically ---
+    # Every band shares the single-band color, so look it up once
+    fill, border = get_band_color(0, 1, st.session_state.colormap)
     for cname, data in st.session_state.isochrones.items():
         for band in data["bands"]:
             geo = band["geojson_feature"]
-            fill, border = get_band_color(0, 1, st.session_state.colormap)
             # Remove popup to avoid blocking clicks, keep tooltip for hover info
             geojson_layer = fl.GeoJson(
                 geo,
@@ -413,6 +424,49 @@ def draw_map():
             fg, first_raster, layer_name=first_raster.name, opacity=0.6
         )
 
+    return fg
+
+
+def _upload_key(uploaded_file):
+    """Identity of an uploaded file that is stable across reruns."""
+    return None if uploaded_file is None else uploaded_file.file_id
+
+
+def _feature_group_state() -> tuple:
+    """
+    Snapshot of everything build_feature_group() reads. Isochrone entries are
+    replaced (never mutated) on update, so their identities are enough.
+    """
+    rasters = st.session_state.uploaded_rasters
+    return (
+        st.session_state.get("colormap"),
+        _upload_key(st.session_state.get("uploaded_boundary")),
+        _upload_key(rasters[0]) if rasters else None,
+        tuple(st.session_state.isochrones.values()),
+    )
+
+
+def get_feature_group():
+    """Reuse the last feature group while the map state is unchanged."""
+    return get_cached_feature_group(
+        _feature_group_state(), _same_state, build_feature_group
+    )
+
+
+def _same_state(old: tuple, new: tuple) -> bool:
+    """Compare snapshots: values for colormap/uploads, identity for isochrones."""
+    if old[:3] != new[:3] or len(old[3]) != len(new[3]):
+        return False
+    return all(a is b for a, b in zip(old[3], new[3]))
+
+
+def draw_map():
+    """Draw the folium map and update dynamically using st_folium's new parameters."""
+    m = create_base_map()
+    # Rebuilding every GeoJson/overlay layer on each widget rerun is the costly
+    # part of drawing; only do it when the underlying state changed
+    fg = get_feature_group()
+
     # --- Compute map center and zoom ---
     if "coord_center" in st.session_state:
         center = st.session_state.coord_center
@@ -507,7 +561,9 @@ def compute_raster_stats():
 
     # --- Call API ---
     with st.spinner(t("raster.computing_stats")):
-        result = call_api(RASTER_STATS_ENDPOINT, payload)
+        # Uploads are rewritten to fixed paths, so the payload can stay the same
+        # while the files change; the API's cache keys on file mtimes instead
+        result = call_api(RASTER_STATS_ENDPOINT, payload, cache=False)
         if not result:
             st.error(t("raster.stats_failed"))
             return
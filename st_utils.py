@@ -1,13 +1,19 @@
 """Shared Streamlit/Folium utilities used by both st_app.py and st_raster_app.py."""
 
-import json
+import math
 import uuid
-from typing import Dict, List, Optional, Tuple
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Tuple
 
+import numpy as np
+import orjson
 import pandas as pd
 import requests
 import streamlit as st
 from loguru import logger
+from pydantic import TypeAdapter
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 from isolysis.analysis import format_time_display  # noqa: F401 — re-export
 from isolysis.constants import DEFAULT_MAP_CENTER
@@ -15,15 +21,82 @@ from isolysis.models import Coordinate
 from translations import t
 
 REQUIRED_COLUMNS = {"Categoria", "Subcategoria", "Nombre", "Latitud", "Longitud"}
+TABULAR_COLUMNS = REQUIRED_COLUMNS | {"Prod", "Region", "Municipality"}
+KNOWN_JSON_FIELDS = frozenset(("id", "lat", "lon", "name", "region", "municipality"))
+# Validates a whole JSON upload in one pydantic-core call
+_COORDINATES_ADAPTER = TypeAdapter(List[Coordinate])
+
+
+@st.cache_resource
+def get_api_session() -> requests.Session:
+    """Keep-alive session shared across reruns, so clicks reuse API connections."""
+    session = requests.Session()
+    # Only failures to connect (e.g. a dropped keep-alive connection) are
+    # retried, for POST too: the request never reached the API. Read timeouts
+    # are not, since the abandoned work keeps running server-side, and
+    # statuses are not either (the API's 503 for a missing key is final)
+    retry = Retry(
+        total=2,
+        connect=2,
+        read=0,
+        status=0,
+        backoff_factor=0.2,
+        allowed_methods=None,
+    )
+    adapter = HTTPAdapter(pool_connections=10, pool_maxsize=20, max_retries=retry)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+class _PartialResult(Exception):
+    """Carries a response that must not be cached (some centroids failed)."""
+
+    def __init__(self, result: Dict):
+        super().__init__("partial result")
+        self.result = result
+
+
+def _send_json(url: str, data: bytes) -> Dict:
+    """POST a serialized payload and decode the JSON response."""
+    response = get_api_session().post(
+        url,
+        data=data,
+        headers={"Content-Type": "application/json"},
+        timeout=30,
+    )
+    response.raise_for_status()
+    return orjson.loads(response.content)
 
 
-def call_api(url: str, payload: Dict) -> Optional[Dict]:
-    """Call the isochrones API endpoint"""
+@st.cache_data(ttl=3600, max_entries=64, show_spinner=False)
+def _post_json(url: str, data: bytes) -> Dict:
+    """POST a serialized payload; identical requests within the TTL skip the API.
+
+    Errors raise, so failed calls are never cached; neither are responses where
+    some centroids failed, which are handed back through _PartialResult.
+    """
+    result = _send_json(url, data)
+    if result.get("successful_computations", 0) < result.get("total_centroids", 0):
+        raise _PartialResult(result)
+    return result
+
+
+def call_api(url: str, payload: Dict, cache: bool = True) -> Optional[Dict]:
+    """
+    Call an API endpoint. ``cache=False`` always hits the API, for payloads
+    that reference files whose contents the request bytes do not capture.
+    """
     try:
-        response = requests.post(url, json=payload, timeout=30)
-        response.raise_for_status()
-        result = response.json()
-        return result
+        # orjson on both ends: requests' json= and .json() use the stdlib module,
+        # which is several times slower on large GeoJSON bodies. The serialized
+        # bytes double as the cache key.
+        data = orjson.dumps(
+            payload, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_SORT_KEYS
+        )
+        return _post_json(url, data) if cache else _send_json(url, data)
+    except _PartialResult as e:
+        return e.result
     except requests.exceptions.HTTPError as e:
         # Extract detail from FastAPI JSON error response
         detail = str(e)
@@ -40,6 +113,24 @@ def call_api(url: str, payload: Dict) -> Optional[Dict]:
         return None
 
 
+def get_cached_feature_group(
+    state: tuple,
+    same_state: Callable[[tuple, tuple], bool],
+    build: Callable[[], Any],
+) -> Any:
+    """
+    Return the feature group built for state, reusing the one stored in session
+    state while same_state(previous, state) holds; otherwise rebuild and store it.
+    """
+    cached = st.session_state.get("_feature_group_cache")
+    if cached is not None and same_state(cached[0], state):
+        return cached[1]
+
+    fg = build()
+    st.session_state._feature_group_cache = (state, fg)
+    return fg
+
+
 def get_map_center():
     """Get map center based on uploaded coordinates or last added centroid"""
     # Priority 1: Use uploaded coordinates center
@@ -48,65 +139,97 @@ def get_map_center():
         return (float(c[0]), float(c[1]))
 
     # Priority 2: Use last centroid
-    if st.session_state.centers:
-        last_center_name = list(st.session_state.centers.keys())[-1]
-        last_coords = st.session_state.centers[last_center_name]
+    centers = st.session_state.centers
+    if centers:
+        last_coords = centers[next(reversed(centers))]
         return (float(last_coords["lat"]), float(last_coords["lng"]))
 
     # Default: El Salvador
     return DEFAULT_MAP_CENTER
 
 
-def get_band_color(
-    band_index: int, total_bands: int, colormap: str = "viridis"
-) -> tuple:
-    """Get a color for the band based on its index using matplotlib colormaps"""
-    import matplotlib.colors as mcolors
-    import matplotlib.pyplot as plt
+@lru_cache(maxsize=64)
+def get_band_colors(
+    total_bands: int, colormap: str = "viridis"
+) -> Tuple[Tuple[str, str], ...]:
+    """
+    (fill, border) hex colors for every band index, from one vectorized
+    colormap lookup. Cached, since the palette only depends on its arguments.
+    """
+    # Imported on first use: the isochrone app never colors bands, so its
+    # cold start skips matplotlib entirely
+    import matplotlib
 
-    # Get the colormap
+    # Get the colormap from the registry (no pyplot/backend import needed)
     try:
-        cmap = plt.get_cmap(colormap)
-    except ValueError:
+        cmap = matplotlib.colormaps[colormap]
+    except KeyError:
         # Fallback to viridis if colormap not found
-        cmap = plt.get_cmap("viridis")
+        cmap = matplotlib.colormaps["viridis"]
 
     if total_bands == 1:
         # Single band gets middle of the colormap
-        color_value = 0.5
+        color_values = np.array([0.5])
     else:
-        # For multiple bands, map band_index to colormap
         # Reverse the mapping so smaller time = darker/more intense color
-        color_value = (total_bands - band_index - 1) / (total_bands - 1)
-
-    # Get RGBA color from colormap
-    rgba = cmap(color_value)
-
-    # Convert to hex for fill color
-    hex_color = mcolors.rgb2hex(rgba[:3])
-
-    # Create darker border color by reducing brightness
-    r, g, b = rgba[0], rgba[1], rgba[2]
-    border_hex = mcolors.rgb2hex(
-        (max(0.0, r * 0.7), max(0.0, g * 0.7), max(0.0, b * 0.7))
+        color_values = (total_bands - np.arange(total_bands) - 1) / (total_bands - 1)
+
+    # RGB rows for all bands at once; borders are the same colors darkened.
+    # Hex strings come from one rounded 0-255 table, rounding as to_hex does
+    rgb = cmap(color_values)[:, :3]
+    borders = np.maximum(rgb * 0.7, 0.0)
+    fills_255 = np.round(rgb * 255).astype(int).tolist()
+    borders_255 = np.round(borders * 255).astype(int).tolist()
+    return tuple(
+        ("#%02x%02x%02x" % tuple(fill), "#%02x%02x%02x" % tuple(border))
+        for fill, border in zip(fills_255, borders_255)
     )
 
-    return hex_color, border_hex
+
+def get_band_color(
+    band_index: int, total_bands: int, colormap: str = "viridis"
+) -> tuple:
+    """Get a color for the band based on its index using matplotlib colormaps"""
+    return get_band_colors(total_bands, colormap)[band_index]
 
 
 # -----------------------------
 # Shared utilities
 # -----------------------------
-def _to_float(x):
-    """Convert '13,45' or '13.45' safely to float."""
-    if pd.isna(x):
-        return None
-    if isinstance(x, str):
-        x = x.strip().replace(",", ".")
+def _to_float(values: pd.Series) -> pd.Series:
+    """Convert '13,45' or '13.45' safely to float, unparseable values to NaN."""
+    text = values.astype(str).str.strip().str.replace(",", ".", regex=False)
+    return pd.to_numeric(text, errors="coerce")
+
+
+@lru_cache(maxsize=1)
+def _excel_engine() -> Optional[str]:
+    """
+    Rust-based calamine reader when python-calamine is installed; otherwise None,
+    leaving pandas' per-format default (openpyxl for .xlsx).
+    """
     try:
-        return float(x)
-    except Exception:
+        import python_calamine  # noqa: F401
+    except ImportError:
         return None
+    return "calamine"
+
+
+def _is_tabular_column(column) -> bool:
+    """Only materialize the columns the parser uses."""
+    return str(column).strip() in TABULAR_COLUMNS
+
+
+def _optional_column(df: pd.DataFrame, column: str) -> List[Optional[str]]:
+    """
+    Column values as stripped strings, with missing entries mapped to None.
+    Coerced per value, so numbers (e.g. from Excel) and NaN never reach the
+    model's Optional[str] fields.
+    """
+    return [
+        None if pd.isna(value) else str(value).strip()
+        for value in df[column].tolist()
+    ]
 
 
 # -----------------------------
@@ -120,7 +243,7 @@ def _parse_json_coordinates(uploaded_file) -> Optional[List[Coordinate]]:
     try:
         # Read and parse JSON
         content = uploaded_file.read()
-        data = json.loads(content)
+        data = orjson.loads(content)
 
         if not isinstance(data, list):
             logger.error("JSON must be a list of coordinate objects.")
@@ -138,24 +261,20 @@ def _parse_json_coordinates(uploaded_file) -> Optional[List[Coordinate]]:
 
             # Ensure id
             if "id" not in item:
-                item["id"] = str(uuid.uuid4())
+                item["id"] = uuid.uuid4().hex
 
             # Optional: fold extra fields into metadata
-            metadata = {
-                k: v
-                for k, v in item.items()
-                if k not in ["id", "lat", "lon", "name", "region", "municipality"]
-            }
+            metadata = {k: v for k, v in item.items() if k not in KNOWN_JSON_FIELDS}
             if metadata:
                 item["metadata"] = metadata
 
             normalized.append(item)
 
-        coordinates = [Coordinate(**item) for item in normalized]
+        coordinates = _COORDINATES_ADAPTER.validate_python(normalized)
         logger.success(f"Loaded {len(coordinates)} coordinates from JSON")
         return coordinates
 
-    except json.JSONDecodeError:
+    except orjson.JSONDecodeError:
         logger.error("Invalid JSON format")
         return None
     except Exception as e:
@@ -175,9 +294,11 @@ def _parse_tabular_coordinates(uploaded_file) -> Optional[List[Coordinate]]:
     try:
         file_name = uploaded_file.name.lower()
         if file_name.endswith(".csv"):
-            df = pd.read_csv(uploaded_file)
+            df = pd.read_csv(uploaded_file, usecols=_is_tabular_column)
         elif file_name.endswith((".xlsx", ".xls")):
-            df = pd.read_excel(uploaded_file)
+            df = pd.read_excel(
+                uploaded_file, engine=_excel_engine(), usecols=_is_tabular_column
+            )
         else:
             logger.error("Unsupported tabular file type.")
             return None
@@ -192,8 +313,8 @@ def _parse_tabular_coordinates(uploaded_file) -> Optional[List[Coordinate]]:
             return None
 
         # Clean data
-        df["Latitud"] = df["Latitud"].apply(_to_float)
-        df["Longitud"] = df["Longitud"].apply(_to_float)
+        df["Latitud"] = _to_float(df["Latitud"])
+        df["Longitud"] = _to_float(df["Longitud"])
         df["Nombre"] = df["Nombre"].astype(str).str.strip()
         df["Categoria"] = df["Categoria"].astype(str).str.strip()
         df["Subcategoria"] = df["Subcategoria"].astype(str).str.strip()
@@ -201,51 +322,63 @@ def _parse_tabular_coordinates(uploaded_file) -> Optional[List[Coordinate]]:
         # Handle optional Prod column
         has_prod = "Prod" in df.columns
         if has_prod:
-            df["Prod"] = df["Prod"].apply(_to_float)
+            df["Prod"] = _to_float(df["Prod"])
             logger.info("Found 'Prod' column - production values will be included")
 
         # Handle optional Region column
         has_region = "Region" in df.columns
         if has_region:
-            df["Region"] = df["Region"].astype(str).str.strip()
             logger.info("Found 'Region' column")
 
         # Handle optional Municipality column
         has_municipality = "Municipality" in df.columns
         if has_municipality:
-            df["Municipality"] = df["Municipality"].astype(str).str.strip()
             logger.info("Found 'Municipality' column")
 
-        df = df.dropna(subset=["Latitud", "Longitud"])
+        # Enforce the model's lat/lon ranges (between() also drops NaN)
         df = df[(df["Latitud"].between(-90, 90)) & (df["Longitud"].between(-180, 180))]
 
-        coordinates = []
-        for i, (_, row) in enumerate(df.iterrows()):
-            prod_value = float(row.get("Prod", 0) or 0) if has_prod else 0.0
-            region_value = row.get("Region") if has_region else None
-            municipality_value = row.get("Municipality") if has_municipality else None
-
-            # Handle NaN values
-            if bool(pd.isna(region_value)):
-                region_value = None
-
-            if bool(pd.isna(municipality_value)):
-                municipality_value = None
+        n_rows = len(df)
+        prods = (
+            df["Prod"].fillna(0.0).to_numpy(dtype=float)
+            if has_prod
+            else np.zeros(n_rows)
+        )
+        regions = _optional_column(df, "Region") if has_region else [None] * n_rows
+        municipalities = (
+            _optional_column(df, "Municipality")
+            if has_municipality
+            else [None] * n_rows
+        )
 
+        coordinates = []
+        for i, name, lat, lon, category, subcategory, prod, region, municipality in zip(
+            range(1, n_rows + 1),
+            df["Nombre"].tolist(),
+            df["Latitud"].tolist(),
+            df["Longitud"].tolist(),
+            df["Categoria"].tolist(),
+            df["Subcategoria"].tolist(),
+            prods.tolist(),
+            regions,
+            municipalities,
+        ):
+            # Safe to skip validation: lat/lon were range-checked and every
+            # str field coerced to str (or None) above
             coordinates.append(
-                Coordinate(
-                    id=f"poi_{i + 1}",
-                    name=str(row["Nombre"]),
-                    lat=float(row["Latitud"]),
-                    lon=float(row["Longitud"]),
-                    region=region_value,
+                Coordinate.model_construct(
+                    id=f"poi_{i}",
+                    name=str(name),
+                    lat=float(lat),
+                    lon=float(lon),
+                    region=region,
                     department=None,
-                    municipality=municipality_value,
+                    municipality=municipality,
                     unit_sis=None,
                     metadata={
-                        "Categoria": row["Categoria"],
-                        "Subcategoria": row["Subcategoria"],
-                        "Prod": prod_value,
+                        "Categoria": category,
+                        "Subcategoria": subcategory,
+                        "Prod": prod,
                     },
                 )
             )
@@ -261,7 +394,7 @@ def _parse_tabular_coordinates(uploaded_file) -> Optional[List[Coordinate]]:
 # -----------------------------
 # Generic dispatcher
 # -----------------------------
-@st.cache_data
+@st.cache_data(persist="disk", max_entries=32, show_spinner=False)
 def handle_coordinate_upload(uploaded_file) -> Optional[List[Coordinate]]:
     """
     Detect file type and delegate parsing.
@@ -286,11 +419,41 @@ def handle_coordinate_upload(uploaded_file) -> Optional[List[Coordinate]]:
         return None
 
 
+class CoordinateArray(NamedTuple):
+    """Column (struct-of-arrays) view of a coordinate list for vectorized math."""
+
+    lat: np.ndarray
+    lon: np.ndarray
+    ids: np.ndarray
+
+    @classmethod
+    def from_list(cls, coordinates: List[Coordinate]) -> "CoordinateArray":
+        # One pass into an (n, 2) array instead of per-attribute Python loops
+        lat_lon = np.fromiter(
+            (value for coord in coordinates for value in (coord.lat, coord.lon)),
+            dtype=np.float64,
+            count=2 * len(coordinates),
+        ).reshape(-1, 2)
+        ids = np.array([coord.id for coord in coordinates], dtype=object)
+        return cls(lat=lat_lon[:, 0], lon=lat_lon[:, 1], ids=ids)
+
+
 def get_coordinates_center(coordinates: List[Coordinate]) -> Tuple[float, float]:
-    """Calculate average lat/lon from list of coordinates"""
-    avg_lat = sum(coord.lat for coord in coordinates) / len(coordinates)
-    avg_lon = sum(coord.lon for coord in coordinates) / len(coordinates)
-    return avg_lat, avg_lon
+    """
+    Spherical center of the coordinates: the mean of their unit vectors,
+    converted back to lat/lon. Unlike a plain lat/lon average it stays
+    correct across the antimeridian and over wide latitude ranges.
+    """
+    columns = CoordinateArray.from_list(coordinates)
+    lat = np.radians(columns.lat)
+    lon = np.radians(columns.lon)
+    cos_lat = np.cos(lat)
+    x = float((cos_lat * np.cos(lon)).mean())
+    y = float((cos_lat * np.sin(lon)).mean())
+    z = float(np.sin(lat).mean())
+    center_lat = math.degrees(math.atan2(z, math.hypot(x, y)))
+    center_lon = math.degrees(math.atan2(y, x))
+    return center_lat, center_lon
 
 
 def build_iso4app_payload_options() -> dict:
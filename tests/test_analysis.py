@@ -5,6 +5,7 @@ from shapely.geometry import Polygon
 
 from isolysis.analysis import (
     compute_band_coverage,
+    compute_network_optimisation_index,
     compute_spatial_analysis,
     format_time_display,
     pois_to_geodataframe,
@@ -67,6 +68,14 @@ class TestCoverage:
         assert "poi1" in small_band.poi_ids
         assert "poi2" in small_band.poi_ids
 
+    def test_pois_in_other_crs(self, sample_isochrones, sample_pois):
+        logger.info("Testing coverage with POIs in a different CRS")
+        pois_gdf = pois_to_geodataframe(sample_pois).to_crs(epsg=3857)
+        coverages = compute_band_coverage(sample_isochrones, pois_gdf)
+
+        small_band = next(c for c in coverages if c.band_hours == 0.25)
+        assert sorted(small_band.poi_ids) == ["poi1", "poi2"]
+
     def test_empty_pois(self, sample_isochrones):
         logger.info("Testing coverage with empty POIs")
         empty_gdf = gpd.GeoDataFrame({"id": [], "geometry": []}, crs="EPSG:4326")
@@ -99,6 +108,40 @@ class TestSpatialAnalysis:
         assert "poi3" in oob.oob_poi_ids
         assert oob.oob_percentage > 0
 
+    def test_noi_counts_duplicate_ids_once(self):
+        logger.info("Testing NOI with POIs sharing an id")
+        isochrones = gpd.GeoDataFrame(
+            [
+                {
+                    "centroid_id": "C1",
+                    "band_hours": 0.5,
+                    "geometry": Polygon([(0, 0), (0, 2), (2, 2), (2, 0)]),
+                },
+                {
+                    "centroid_id": "C2",
+                    "band_hours": 0.5,
+                    "geometry": Polygon([(1, 0), (1, 2), (3, 2), (3, 0)]),
+                },
+            ],
+            crs="EPSG:4326",
+        )
+        pois = [
+            POI(id="dup", lat=1.2, lon=1.5),  # Both in the intersection
+            POI(id="dup", lat=1.6, lon=1.5),
+            POI(id="poi1", lat=0.5, lon=0.5),  # C1 only
+            POI(id="poi2", lat=5.0, lon=5.0),  # Outside all
+        ]
+        analysis = compute_spatial_analysis(isochrones, pois)
+
+        # Same value as counting unique ids over the reported intersections
+        expected = compute_network_optimisation_index(
+            centroid_coverages=analysis.coverage_analysis,
+            intersection_matrix=analysis.intersection_analysis,
+            oob_analysis=analysis.oob_analysis,
+            total_pois=len(pois),
+        )
+        assert analysis.network_optimization_index == pytest.approx(expected)
+
     def test_empty_input(self):
         logger.info("Testing analysis with empty input")
         empty_gdf = gpd.GeoDataFrame(
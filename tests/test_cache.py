@@ -0,0 +1,103 @@
+import os
+import time
+
+from fastapi.testclient import TestClient
+
+from api import app as app_module
+from api.cache import ResponseCache, request_cache_key
+from isolysis.models import IsochroneRequest, IsochroneResponse
+
+
+def _request(lat: float = 13.7) -> IsochroneRequest:
+    return IsochroneRequest.model_validate(
+        {"centroids": [{"lat": lat, "lon": -88.9, "rho": 0.5, "id": "C1"}]}
+    )
+
+
+class TestResponseCache:
+    def test_get_set(self):
+        cache = ResponseCache(maxsize=4, ttl=60)
+        assert cache.get("a") is None
+        cache.set("a", b"{}")
+        assert cache.get("a") == b"{}"
+
+    def test_lru_eviction(self):
+        cache = ResponseCache(maxsize=2, ttl=60)
+        cache.set("a", b"1")
+        cache.set("b", b"2")
+        cache.get("a")  # "b" becomes least recently used
+        cache.set("c", b"3")
+        assert len(cache) == 2
+        assert cache.get("b") is None
+        assert cache.get("a") == b"1"
+
+    def test_ttl_expiry(self):
+        cache = ResponseCache(maxsize=2, ttl=0.01)
+        cache.set("a", b"1")
+        time.sleep(0.02)
+        assert cache.get("a") is None
+        assert len(cache) == 0
+
+
+class TestCacheKey:
+    def test_identical_requests_share_key(self):
+        assert request_cache_key(_request()) == request_cache_key(_request())
+
+    def test_different_requests_differ(self):
+        assert request_cache_key(_request(13.7)) != request_cache_key(_request(13.8))
+
+    def test_extra_state_changes_key(self):
+        request = _request()
+        assert request_cache_key(request, extra=b"1") != request_cache_key(
+            request, extra=b"2"
+        )
+
+
+class TestIsochroneEndpointCache:
+    def _post_twice(self, monkeypatch, successful: int) -> int:
+        """POST the same request twice; return how many times it was computed."""
+        calls = []
+
+        async def process(request):
+            calls.append(request)
+            return IsochroneResponse(
+                provider="osmnx",
+                results=[],
+                total_centroids=1,
+                successful_computations=successful,
+            )
+
+        monkeypatch.setattr(app_module, "process_isochrone_request", process)
+        app_module.ISOCHRONE_CACHE.clear()
+        client = TestClient(app_module.app)
+        payload = {"centroids": [{"lat": 13.7, "lon": -88.9, "rho": 0.5}]}
+        for _ in range(2):
+            assert client.post("/isochrones", json=payload).status_code == 200
+        app_module.ISOCHRONE_CACHE.clear()
+        return len(calls)
+
+    def test_complete_response_cached(self, monkeypatch):
+        assert self._post_twice(monkeypatch, successful=1) == 1
+
+    def test_partial_response_not_cached(self, monkeypatch):
+        assert self._post_twice(monkeypatch, successful=0) == 2
+
+
+class TestProviderKeyRefresh:
+    def test_dotenv_edit_refreshes_keys(self, tmp_path, monkeypatch):
+        """A key added to .env is picked up without restarting the process"""
+        dotenv = tmp_path / ".env"
+        dotenv.write_text("")
+        monkeypatch.delenv("MAPBOX_API_KEY", raising=False)
+        monkeypatch.setattr(app_module, "DOTENV_PATH", str(dotenv))
+        app_module.refresh_provider_keys()
+        assert app_module.validate_provider_keys("mapbox") is not None
+
+        dotenv.write_text("MAPBOX_API_KEY=test-key\n")
+        stat = dotenv.stat()
+        os.utime(dotenv, (stat.st_atime, stat.st_mtime + 1))
+        app_module.sync_provider_keys()
+        assert app_module.validate_provider_keys("mapbox") is None
+
+        monkeypatch.undo()
+        app_module.refresh_provider_keys()
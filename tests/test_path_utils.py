@@ -0,0 +1,37 @@
+import os
+import shutil
+
+import pytest
+
+from api.path_utils import PROJECT_ROOT, resolve_project_path
+
+
+@pytest.fixture
+def tmp_project_dir():
+    """Scratch directory inside the project root."""
+    path = PROJECT_ROOT / "data" / "tmp" / "test_path_utils"
+    path.mkdir(parents=True, exist_ok=True)
+    yield path
+    shutil.rmtree(path, ignore_errors=True)
+
+
+class TestResolveProjectPath:
+    def test_relative_path_anchored_at_root(self, tmp_project_dir):
+        target = tmp_project_dir / "file.tif"
+        target.write_bytes(b"")
+        relative = os.path.relpath(target, PROJECT_ROOT)
+        assert resolve_project_path(relative) == str(target)
+
+    def test_traversal_blocked(self):
+        assert resolve_project_path("../outside.tif", must_exist=False) is None
+
+    def test_symlink_swapped_outside_is_blocked(self, tmp_project_dir, tmp_path):
+        """A path that later becomes a symlink out of the root is re-checked"""
+        link = tmp_project_dir / "upload"
+        link.mkdir()
+        path = str(link / "file.tif")
+        assert resolve_project_path(path, must_exist=False) is not None
+
+        link.rmdir()
+        link.symlink_to(tmp_path, target_is_directory=True)
+        assert resolve_project_path(path, must_exist=False) is None
@@ -1,14 +1,19 @@
 import os
 import shutil
+from concurrent.futures.process import BrokenProcessPool
 
 import numpy as np
 import pytest
 import rasterio
 from fastapi.testclient import TestClient
 from rasterio.transform import from_origin
-from shapely.geometry import Polygon, mapping
+from rasterstats import zonal_stats
+from shapely.geometry import Polygon, box, mapping, shape
 
+from api import rasters
 from api.app import app
+from isolysis import raster
+from isolysis.raster import DEFAULT_NODATA, STATS_LIST, compute_stats_table
 
 client = TestClient(app)
 
@@ -96,3 +101,94 @@ class TestRasterStats:
             r for r in data["results"] if r.get("scope") == "isochrone"
         ]
         assert len(isochrone_results) == 0
+
+    def test_repeat_request_served_from_cache(
+        self, sample_isochrones, sample_raster, monkeypatch
+    ):
+        """An identical request over unchanged files skips the raster work"""
+        payload = {
+            "isochrones": sample_isochrones,
+            "rasters": [{"path": sample_raster}],
+        }
+        first = client.post("/raster-stats", json=payload)
+        assert first.status_code == 200
+
+        def fail(*args, **kwargs):
+            raise AssertionError("raster stats recomputed")
+
+        monkeypatch.setattr(rasters, "_compute_raster_stats", fail)
+        second = client.post("/raster-stats", json=payload)
+        assert second.status_code == 200
+        assert second.json() == first.json()
+
+    def test_failed_raster_read_not_cached(
+        self, sample_isochrones, sample_raster, monkeypatch
+    ):
+        """Zero-filled stats from an unreadable raster are recomputed next time"""
+        broken = os.path.join(os.path.dirname(sample_raster), "broken.tif")
+        with open(broken, "wb") as f:
+            f.write(b"not a raster")
+        payload = {
+            "isochrones": sample_isochrones,
+            "rasters": [{"path": broken}],
+        }
+        compute = rasters._compute_raster_stats
+        calls = []
+
+        def counted(*args, **kwargs):
+            calls.append(args)
+            return compute(*args, **kwargs)
+
+        monkeypatch.setattr(rasters, "_compute_raster_stats", counted)
+        for _ in range(2):
+            response = client.post("/raster-stats", json=payload)
+            assert response.status_code == 200
+        assert len(calls) == 2
+
+    def test_union_window_matches_per_polygon_reads(
+        self, sample_isochrones, sample_raster, monkeypatch
+    ):
+        """Reading the union window once gives the same stats as per-polygon reads"""
+        geoms = [shape(iso["geometry"]) for iso in sample_isochrones]
+        batched = compute_stats_table(geoms, sample_raster)
+
+        monkeypatch.setattr(raster, "MAX_BLOCK_BYTES", 0)
+        per_polygon = compute_stats_table(geoms, sample_raster)
+
+        assert np.array_equal(batched, per_polygon)
+        assert batched[:, 0].min() > 0
+
+    def test_overhanging_polygons_match_rasterstats(self, sample_raster):
+        """Without a nodata value, pixels past the raster edge count as 0"""
+        geoms = [box(8.5, 8.5, 12, 12), box(-3, 2, 1.5, 4), box(20, 20, 22, 22)]
+        table = compute_stats_table(geoms, sample_raster)
+
+        expected = zonal_stats(
+            geoms,
+            sample_raster,
+            stats=STATS_LIST,
+            nodata=DEFAULT_NODATA,
+            all_touched=True,
+        )
+        for row, ref in zip(table, expected):
+            assert row[STATS_LIST.index("count")] > 0
+            cleaned = [max(ref[stat] or 0.0, 0.0) for stat in STATS_LIST]
+            assert np.allclose(row, cleaned)
+
+    def test_broken_worker_pool_is_replaced(self, sample_isochrones, sample_raster):
+        """A crashed worker does not poison later stats requests"""
+        broken = raster.get_process_pool()
+        with pytest.raises(BrokenProcessPool):
+            broken.submit(os._exit, 1).result()
+
+        geoms = [shape(iso["geometry"]) for iso in sample_isochrones]
+        columns = {"centroid_id": ["C1", "C2"]}
+        per_raster = raster._records_per_raster(
+            geoms, columns, [sample_raster, sample_raster]
+        )
+
+        assert raster.get_process_pool() is not broken
+        assert per_raster[0] == per_raster[1]
+        assert [r["count"] for r in per_raster[0]] == list(
+            compute_stats_table(geoms, sample_raster)[:, 0]
+        )
@@ -0,0 +1,62 @@
+import time
+
+import orjson
+from fastapi.testclient import TestClient
+from shapely.geometry import box
+
+from api import services
+from api.app import app
+
+client = TestClient(app)
+
+
+class _SlowFirstProvider:
+    """Stub provider whose earlier centroids finish last."""
+
+    def compute(self, centroids, **kwargs):
+        centroid = centroids[0]
+        time.sleep(0.05 * (3 - int(centroid["id"][1:])))
+        lon, lat = centroid["lon"], centroid["lat"]
+        return [
+            {
+                "centroid_id": centroid["id"],
+                "band_hours": 0.5,
+                "geometry": box(lon - 1, lat - 1, lon + 1, lat + 1),
+            }
+        ]
+
+
+def _payload():
+    return {
+        "centroids": [
+            {"id": f"C{i}", "lat": 0.0, "lon": 0.5 * i, "rho": 0.5} for i in range(3)
+        ],
+        "pois": [
+            {"id": f"P{i}", "lat": 0.0, "lon": 0.3 * i - 0.5} for i in range(8)
+        ],
+    }
+
+
+def _analysis(body: dict) -> dict:
+    analysis = dict(body["spatial_analysis"])
+    analysis.pop("analysis_timestamp", None)
+    return analysis
+
+
+class TestStreamIsochrones:
+    def test_summary_follows_request_order(self, monkeypatch):
+        """The streamed analysis matches /isochrones regardless of completion order"""
+        monkeypatch.setattr(
+            services, "get_isochrone_provider", lambda name: _SlowFirstProvider()
+        )
+        response = client.post("/isochrones/stream", json=_payload())
+        assert response.status_code == 200
+        lines = [orjson.loads(line) for line in response.content.splitlines()]
+
+        # Lines arrive as centroids complete, i.e. in reverse here
+        ids = [line["centroid_id"] for line in lines if line["type"] == "isochrone"]
+        assert ids == ["C2", "C1", "C0"]
+
+        expected = client.post("/isochrones", json=_payload())
+        assert expected.status_code == 200
+        assert _analysis(lines[-1]) == _analysis(expected.json())